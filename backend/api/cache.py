@@ -0,0 +1,250 @@
+import re
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+import asyncpg
+import orjson
+from fastapi_cache.backends.redis import RedisBackend
+from fastapi_cache.coder import Coder
+from fastapi_cache.types import Backend
+from starlette.responses import Response
+
+from metrics import CACHE_LOOKUPS, COALESCED_REQUESTS, statement
+
+
+logger = logging.getLogger("api.cache")
+
+NORMALIZE_QUERY_SQL = statement(
+    "normalize_query", "SELECT plainto_tsquery('english', $1)::text"
+)
+
+
+class LRUCache:
+    """
+    In-process cache of serialized payloads, bounded by entry count and total
+    bytes, with a TTL per entry. The least recently used entries are evicted
+    first once either bound is exceeded.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_with_ttl(self, key: str) -> Tuple[int, Optional[bytes]]:
+        _, ttl, value = self.lookup(key)
+        return ttl, value
+
+    def lookup(self, key: str) -> Tuple[str, int, Optional[bytes]]:
+        """Like get_with_ttl, but also reports 'hit', 'stale' (expired) or 'miss'"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return "miss", 0, None
+        expires_at, value = entry
+        remaining = expires_at - time.monotonic()
+        if remaining <= 0:
+            self.delete(key)
+            return "stale", 0, None
+        self._entries.move_to_end(key)
+        return "hit", int(remaining), value
+
+    def set(self, key: str, value: bytes, expire: int) -> None:
+        if len(value) > self.max_bytes:
+            return
+        self.delete(key)
+        self._entries[key] = (time.monotonic() + expire, value)
+        self.size_bytes += len(value)
+        while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.size_bytes -= len(evicted)
+
+    def delete(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self.size_bytes -= len(entry[1])
+        return True
+
+    def clear(self, prefix: str = "") -> int:
+        keys = [key for key in self._entries if key.startswith(prefix)]
+        for key in keys:
+            self.delete(key)
+        return len(keys)
+
+
+class JSONBytesResponse(Response):
+    """A response whose content is already-encoded JSON bytes"""
+
+    media_type = "application/json"
+
+
+class JSONBytesCoder(Coder):
+    """
+    fastapi-cache coder for endpoints that return JSONBytesResponse. The
+    response body is cached as-is and a hit is sent back as a new response
+    around the same bytes, skipping JSON decoding, response_model validation
+    and re-encoding.
+    """
+
+    @classmethod
+    def encode(cls, value: Any) -> bytes:
+        if isinstance(value, Response):
+            return bytes(value.body)
+        return orjson.dumps(value)
+
+    @classmethod
+    def decode(cls, value: bytes) -> Any:
+        return orjson.loads(value)
+
+    @classmethod
+    def decode_as_type(cls, value: bytes, *, type_: Any = None) -> Any:
+        return JSONBytesResponse(content=value)
+
+
+class TwoTierBackend(Backend):
+    """
+    fastapi-cache backend that serves from an in-process LRUCache (L1) and
+    falls through to Redis (L2). Redis hits are copied into L1 for their
+    remaining TTL. Without Redis the L1 cache is used on its own, and Redis
+    errors degrade to L1-only instead of failing the request.
+    """
+
+    def __init__(self, l1: LRUCache, redis: Optional[RedisBackend] = None):
+        self.l1 = l1
+        self.redis = redis
+
+    async def get_with_ttl(self, key: str) -> Tuple[int, Optional[bytes]]:
+        # Keys look like "<prefix>:<namespace>:..."
+        parts = key.split(":", 2)
+        namespace = parts[1] if len(parts) > 2 else ""
+
+        result, ttl, value = self.l1.lookup(key)
+        if value is not None:
+            CACHE_LOOKUPS.labels(namespace, "hit_l1").inc()
+            return ttl, value
+
+        if self.redis is not None:
+            try:
+                ttl, value = await self.redis.get_with_ttl(key)
+            except Exception as e:
+                logger.warning(f"Redis read failed for '{key}': {str(e)}")
+                ttl, value = 0, None
+
+        if value is not None and ttl > 0:
+            CACHE_LOOKUPS.labels(namespace, "hit_redis").inc()
+            self.l1.set(key, value, ttl)
+            return ttl, value
+
+        CACHE_LOOKUPS.labels(namespace, result).inc()
+        return 0, None
+
+    async def get(self, key: str) -> Optional[bytes]:
+        _, value = await self.get_with_ttl(key)
+        return value
+
+    async def set(self, key: str, value: bytes, expire: Optional[int] = None) -> None:
+        self.l1.set(key, value, expire or 0)
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(key, value, expire)
+        except Exception as e:
+            logger.warning(f"Redis write failed for '{key}': {str(e)}")
+
+    async def clear(self, namespace: Optional[str] = None, key: Optional[str] = None) -> int:
+        if namespace:
+            count = self.l1.clear(namespace)
+        elif key:
+            count = int(self.l1.delete(key))
+        else:
+            return 0
+        if self.redis is not None:
+            count = max(count, await self.redis.clear(namespace=namespace, key=key))
+        return count
+
+
+class QueryNormalizer:
+    """
+    Maps raw search strings to the tsquery Postgres would search for, so
+    "Biden", "biden " and "BIDEN" (or "elections" and "election") share one
+    cache entry. Normalizing through plainto_tsquery itself guarantees two
+    queries only share a key when Postgres would treat them identically.
+    Results are memoized, so a repeated query costs no round trip.
+    """
+
+    def __init__(self, max_entries: int = 10000, coalescer: Optional["SingleFlight"] = None):
+        self.max_entries = max_entries
+        self.coalescer = coalescer
+        self._memo: "OrderedDict[str, str]" = OrderedDict()
+
+    @staticmethod
+    def prenormalize(query: str) -> str:
+        """Lowercase and collapse whitespace, which plainto_tsquery ignores"""
+        return re.sub(r"\s+", " ", query).strip().lower()
+
+    async def normalize(self, pool: asyncpg.Pool, query: str) -> str:
+        """Return the tsquery text for a query ('' if it has no lexemes)"""
+        key = self.prenormalize(query)
+        normalized = self._memo.get(key)
+        if normalized is not None:
+            self._memo.move_to_end(key)
+            return normalized
+
+        if self.coalescer is not None:
+            # A new trending query arrives many times at once; look it up once
+            normalized = await self.coalescer.do(
+                ("normalize", key), lambda: self._lookup(pool, key)
+            )
+        else:
+            normalized = await self._lookup(pool, key)
+
+        self._memo[key] = normalized
+        if len(self._memo) > self.max_entries:
+            self._memo.popitem(last=False)
+        return normalized
+
+    @staticmethod
+    async def _lookup(pool: asyncpg.Pool, key: str) -> str:
+        async with pool.acquire() as conn:
+            return await conn.fetchval(NORMALIZE_QUERY_SQL, key)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls: the first caller for a key runs the
+    call and everyone who asks for the same key while it is in flight awaits
+    that result instead of running it again. The call runs as its own task,
+    so a disconnecting first caller doesn't cancel it for the others.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._inflight: Dict[Hashable, "asyncio.Task[Any]"] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+            COALESCED_REQUESTS.inc()
+            logger.info(f"Coalesced request for {key} ({self.coalesced} coalesced so far)")
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved even if every caller went away
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,110 @@
+import gzip
+import asyncio
+import logging
+from typing import Optional
+
+from cache import LRUCache
+from metrics import COMPRESSED_RESPONSES
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+
+logger = logging.getLogger("api.compression")
+
+# Content types worth compressing; NDJSON streams are left alone so they
+# keep streaming
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+# Bodies above this size are compressed off the event loop
+THREAD_THRESHOLD_BYTES = 256 * 1024
+
+# Compressed bodies are cached for as long as the responses they encode
+COMPRESSED_TTL_SECONDS = 86400
+
+
+def parse_accept_encoding(header: str) -> dict:
+    """Map each coding in an Accept-Encoding header to its q-value"""
+    codings = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        codings[coding] = q
+    return codings
+
+
+def strip_encoding_suffix(etag: str) -> str:
+    """The ETag of the uncompressed representation of a compressed response"""
+    for encoding in ("br", "gzip"):
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+
+class ResponseCompressor:
+    """
+    Negotiates gzip or brotli for response bodies of at least min_bytes and
+    compresses them. Bodies that carry a strong ETag are fully determined by
+    it, so their compressed bytes are cached under the ETag and each popular
+    response is only compressed once per encoding.
+    """
+
+    def __init__(
+        self,
+        min_bytes: int = 1024,
+        cache: Optional[LRUCache] = None,
+        gzip_level: int = 6,
+        brotli_quality: int = 5
+    ):
+        self.min_bytes = min_bytes
+        self.cache = cache if cache is not None else LRUCache()
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def negotiate(self, accept_encoding: str) -> Optional[str]:
+        """Best encoding the client accepts: br, then gzip, else None"""
+        codings = parse_accept_encoding(accept_encoding)
+        wildcard = codings.get("*", 0.0)
+        candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+        best, best_q = None, 0.0
+        for encoding in candidates:
+            q = codings.get(encoding, wildcard)
+            if q > best_q:
+                best, best_q = encoding, q
+        return best
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        # mtime=0 keeps the output identical for identical bodies
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    async def compress(self, body: bytes, encoding: str, etag: Optional[str] = None) -> bytes:
+        key = f"{etag}:{encoding}" if etag and not etag.startswith("W/") else None
+        if key is not None:
+            _, cached = self.cache.get_with_ttl(key)
+            if cached is not None:
+                COMPRESSED_RESPONSES.labels(encoding, "cache_hit").inc()
+                return cached
+
+        if len(body) >= THREAD_THRESHOLD_BYTES:
+            compressed = await asyncio.to_thread(self._compress, body, encoding)
+        else:
+            compressed = self._compress(body, encoding)
+        COMPRESSED_RESPONSES.labels(encoding, "compressed").inc()
+
+        if key is not None:
+            self.cache.set(key, compressed, COMPRESSED_TTL_SECONDS)
+        return compressed
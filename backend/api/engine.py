@@ -0,0 +1,315 @@
+import os
+import re
+import math
+import heapq
+import asyncio
+import logging
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import asyncpg
+
+from metrics import statement
+
+
+logger = logging.getLogger("api.engine")
+
+# Every perspective with its search_vector lexemes and how often each appears
+# in the title (weight A) and quote (weight B). Indexing Postgres's own
+# lexemes keeps stemming and stop words identical to the tsquery side.
+# $1 only loads rows changed after this time (NULL for all)
+ENGINE_DOCUMENTS_SQL = statement("engine_documents", """
+    SELECT
+        p.id::text AS id, p.title, p.source, p.community, p.quote, p.sentiment,
+        SPLIT_PART(p.created_at::text, ' ', 1) as date,
+        p.url,
+        p.updated_at,
+        terms.lexemes,
+        terms.title_tf,
+        terms.quote_tf
+    FROM perspectives p
+    CROSS JOIN LATERAL (
+        SELECT
+            array_agg(t.lexeme) AS lexemes,
+            array_agg(COALESCE(cardinality(array_positions(t.weights, 'A')), 0)) AS title_tf,
+            array_agg(COALESCE(cardinality(array_positions(t.weights, 'B')), 0)) AS quote_tf
+        FROM unnest(p.search_vector) AS t
+    ) terms
+    WHERE $1::timestamptz IS NULL OR p.updated_at > $1::timestamptz
+""")
+
+# Matches for a tsquery and the top k by Postgres's own ranking, used by the
+# consistency check
+CHECK_COUNT_SQL = "SELECT COUNT(*) FROM perspectives WHERE search_vector @@ $1::tsquery"
+CHECK_TOP_K_SQL = """
+    SELECT p.id::text AS id
+    FROM perspectives p
+    WHERE p.search_vector @@ $1::tsquery
+    ORDER BY ts_rank_cd(p.search_vector, $1::tsquery) DESC, p.id DESC
+    LIMIT $2
+"""
+
+# Rows re-read on every incremental load, so a transaction that committed
+# after a later one isn't missed
+CATCH_UP_OVERLAP_SECONDS = 60
+
+TSQUERY_LEXEME_RE = re.compile(r"'((?:[^'\\]|''|\\.)*)'")
+
+
+def tsquery_lexemes(tsquery: str) -> Optional[List[str]]:
+    """
+    Lexemes of a plainto_tsquery result, which ANDs them together. Returns
+    None for anything else (phrase, OR or NOT operators), which the engine
+    leaves to Postgres.
+    """
+    if re.search(r"[|!<]", TSQUERY_LEXEME_RE.sub("", tsquery)):
+        return None
+    lexemes = []
+    for match in TSQUERY_LEXEME_RE.finditer(tsquery):
+        lexeme = re.sub(r"\\(.)", r"\1", match.group(1).replace("''", "'"))
+        if lexeme not in lexemes:
+            lexemes.append(lexeme)
+    return lexemes
+
+
+class SearchEngine:
+    """
+    In-process full-text search over perspectives, an alternative to running
+    ts_rank_cd queries on Postgres for every search cache miss.
+
+    Each lexeme has a posting list of document numbers and term frequencies
+    in two parallel typed arrays. Documents are appended in load order, so
+    posting lists stay sorted without reindexing. A changed document is
+    appended again under a new number and its old number is marked dead.
+    Matching ANDs the query lexemes like the tsquery does, and matches are
+    ranked with BM25, counting title occurrences TITLE_BOOST times.
+    """
+
+    K1 = 1.2
+    B = 0.75
+    TITLE_BOOST = 2.0
+
+    def __init__(self):
+        self.documents: List[dict] = []
+        self.ids: List[str] = []
+        self.lengths = array("f")
+        self.alive = bytearray()
+        self.number_by_id: Dict[str, int] = {}
+        self.postings: Dict[str, Tuple[array, array]] = {}
+        self.total_length = 0.0
+        self.live_count = 0
+        self.watermark: Optional[datetime] = None
+        self.built_version: Optional[int] = None
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return self.live_count
+
+    def add(self, record) -> None:
+        """Index one row of ENGINE_DOCUMENTS_SQL, replacing an older copy"""
+        document = {
+            "id": record["id"],
+            "title": record["title"],
+            "source": record["source"],
+            "community": record["community"],
+            "quote": record["quote"],
+            "sentiment": float(record["sentiment"]),
+            "date": record["date"],
+            "url": record["url"],
+        }
+        previous = self.number_by_id.get(document["id"])
+        if previous is not None:
+            if self.documents[previous] == document:
+                return
+            self.alive[previous] = 0
+            self.live_count -= 1
+            self.total_length -= self.lengths[previous]
+
+        number = len(self.documents)
+        length = 0.0
+        for lexeme, title_tf, quote_tf in zip(
+            record["lexemes"] or [], record["title_tf"] or [], record["quote_tf"] or []
+        ):
+            tf = self.TITLE_BOOST * title_tf + quote_tf
+            if not tf:
+                # Lexemes with no positions still match, like in Postgres
+                tf = 1.0
+            postings = self.postings.get(lexeme)
+            if postings is None:
+                postings = self.postings[lexeme] = (array("I"), array("f"))
+            postings[0].append(number)
+            postings[1].append(tf)
+            length += tf
+
+        self.documents.append(document)
+        self.ids.append(document["id"])
+        self.lengths.append(length)
+        self.alive.append(1)
+        self.number_by_id[document["id"]] = number
+        self.total_length += length
+        self.live_count += 1
+
+    async def load(self, pool: asyncpg.Pool, since: Optional[datetime] = None) -> int:
+        """Index rows changed after since (all rows if None). Returns the row count."""
+        async with pool.acquire() as conn:
+            records = await conn.fetch(ENGINE_DOCUMENTS_SQL, since)
+        for record in records:
+            self.add(record)
+            if self.watermark is None or record["updated_at"] > self.watermark:
+                self.watermark = record["updated_at"]
+        return len(records)
+
+    async def build(self, pool: asyncpg.Pool, version: Optional[int] = None) -> None:
+        count = await self.load(pool)
+        self.built_version = version
+        logger.info(f"Built search engine: {count} perspectives, {len(self.postings)} lexemes")
+
+    async def catch_up(self, pool: asyncpg.Pool, version: Optional[int]) -> None:
+        """
+        Index perspectives changed since the last load if the perspectives
+        data version has moved on. Called before searching, so results are
+        never cached under a version the engine hasn't seen yet.
+        """
+        if version == self.built_version:
+            return
+        async with self._lock:
+            if version == self.built_version:
+                return
+            since = None
+            if self.watermark is not None:
+                since = self.watermark - timedelta(seconds=CATCH_UP_OVERLAP_SECONDS)
+            count = await self.load(pool, since)
+            self.built_version = version
+            logger.info(f"Search engine caught up on {count} perspectives (version {version})")
+
+    def match(self, lexemes: Sequence[str]) -> Dict[int, float]:
+        """BM25 scores of the live documents containing every lexeme"""
+        if not lexemes or not self.live_count:
+            return {}
+        postings = []
+        for lexeme in lexemes:
+            found = self.postings.get(lexeme)
+            if found is None:
+                return {}
+            postings.append(found)
+        # Start from the rarest lexeme so the candidate set is small
+        postings.sort(key=lambda found: len(found[0]))
+
+        total = self.live_count
+        average_length = self.total_length / self.live_count or 1.0
+        scores: Dict[int, float] = {}
+        for i, (numbers, frequencies) in enumerate(postings):
+            frequency = min(len(numbers), total)
+            idf = math.log(1 + (total - frequency + 0.5) / (frequency + 0.5))
+            matched: Dict[int, float] = {}
+            for number, tf in zip(numbers, frequencies):
+                if i == 0:
+                    if not self.alive[number]:
+                        continue
+                    score = 0.0
+                else:
+                    score = scores.get(number)
+                    if score is None:
+                        continue
+                norm = self.K1 * (1 - self.B + self.B * self.lengths[number] / average_length)
+                matched[number] = score + idf * tf * (self.K1 + 1) / (tf + norm)
+            scores = matched
+            if not scores:
+                break
+        return scores
+
+    def search(
+        self,
+        lexemes: Sequence[str],
+        limit: Optional[int],
+        after_rank: Optional[float] = None,
+        after_id: Optional[str] = None
+    ) -> List[Tuple[float, dict]]:
+        """
+        Ranked (score, perspective) pairs after the keyset position
+        (after_rank, after_id), ordered like SEARCH_SQL: score then id, both
+        descending
+        """
+        ranked = (
+            (score, self.ids[number], number)
+            for number, score in self.match(lexemes).items()
+        )
+        if after_rank is not None:
+            ranked = (
+                entry for entry in ranked
+                if (entry[0], entry[1]) < (after_rank, after_id)
+            )
+        if limit is None:
+            top = sorted(ranked, reverse=True)
+        else:
+            top = heapq.nlargest(limit, ranked)
+        return [(score, self.documents[number]) for score, _, number in top]
+
+
+async def check_consistency(conn: asyncpg.Connection, engine: SearchEngine, queries: Sequence[str], k: int) -> bool:
+    """
+    Compare the engine with Postgres for each query: the number of matches
+    must be identical, and the overlap of their top k shows how far BM25 and
+    ts_rank_cd rankings diverge. Returns False if any match count differs.
+    """
+    consistent = True
+    overlaps = []
+    for query in queries:
+        tsquery = await conn.fetchval("SELECT plainto_tsquery('english', $1)::text", query)
+        lexemes = tsquery_lexemes(tsquery) if tsquery else []
+        if lexemes is None:
+            logger.info(f"'{query}': {tsquery} is served by Postgres, skipped")
+            continue
+
+        expected = await conn.fetchval(CHECK_COUNT_SQL, tsquery) if tsquery else 0
+        matched = len(engine.match(lexemes))
+        postgres_top = [
+            record["id"] for record in await conn.fetch(CHECK_TOP_K_SQL, tsquery, k)
+        ] if tsquery else []
+        engine_top = [perspective["id"] for _, perspective in engine.search(lexemes, k)]
+
+        overlap = len(set(postgres_top) & set(engine_top)) / max(len(postgres_top), 1)
+        overlaps.append(overlap)
+        if matched != expected:
+            consistent = False
+            logger.error(f"'{query}': engine matched {matched}, Postgres matched {expected}")
+        logger.info(f"'{query}': {matched} matches, top-{k} overlap {overlap:.0%}")
+
+    if overlaps:
+        logger.info(f"Mean top-{k} overlap over {len(overlaps)} queries: {sum(overlaps) / len(overlaps):.0%}")
+    return consistent
+
+
+async def main(queries: Sequence[str], k: int) -> bool:
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    pool = await asyncpg.create_pool(os.environ["NEON_DB_URL"], min_size=1, max_size=2)
+    try:
+        engine = SearchEngine()
+        await engine.build(pool)
+        async with pool.acquire() as conn:
+            return await check_consistency(conn, engine, queries, k)
+    finally:
+        await pool.close()
+
+
+if __name__ == "__main__":
+    import sys
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Compare the in-process search engine with Postgres full-text search"
+    )
+    parser.add_argument(
+        "queries",
+        nargs="*",
+        default=["trump", "economy", "tariffs", "ukraine", "supreme court", "interest rates"],
+        help="Search queries to compare",
+    )
+    parser.add_argument("--k", type=int, default=10, help="Compare the top k results")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(0 if asyncio.run(main(args.queries, args.k)) else 1)
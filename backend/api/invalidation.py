@@ -0,0 +1,193 @@
+import asyncio
+import hashlib
+import logging
+from typing import Callable, Dict, Iterable, Optional
+
+import asyncpg
+from starlette.requests import Request
+from starlette.responses import Response
+
+from metrics import statement
+
+
+logger = logging.getLogger("api.invalidation")
+
+# Postgres channel writers NOTIFY on; the payload is "<namespace>:<version>"
+CHANNEL = "cache_invalidation"
+
+# Reconnect delays for a lost listener connection, doubling up to the maximum
+RECONNECT_INITIAL_SECONDS = 1
+RECONNECT_MAX_SECONDS = 60
+
+# Bump a namespace's version and notify listeners. The notification is only
+# delivered once the surrounding transaction commits.
+BUMP_VERSION_SQL = statement("bump_cache_version", """
+    WITH bumped AS (
+        UPDATE cache_versions
+        SET version = version + 1
+        WHERE namespace = $1
+        RETURNING namespace, version
+    )
+    SELECT version, pg_notify('cache_invalidation', namespace || ':' || version)
+    FROM bumped
+""")
+
+
+class CacheVersions:
+    """
+    Tracks the current version of each kind of cached data and builds cache
+    keys that embed the versions an endpoint depends on. Bumping a version
+    moves readers to a fresh key, so cached entries never need to be deleted
+    and TTLs can stay long.
+    """
+
+    def __init__(self, dependencies: Dict[str, Iterable[str]]):
+        # Cache namespace (as passed to @cache) -> data namespaces it reads
+        self.dependencies = {name: tuple(deps) for name, deps in dependencies.items()}
+        self.versions: Dict[str, int] = {}
+        self._dsn: Optional[str] = None
+        self._listener_conn: Optional[asyncpg.Connection] = None
+        self._subscriptions: Dict[str, Callable] = {}
+        self._reconnect_task: Optional["asyncio.Task[None]"] = None
+        self._closing = False
+
+    async def load(self, conn: asyncpg.Connection) -> None:
+        records = await conn.fetch("SELECT namespace, version FROM cache_versions")
+        for record in records:
+            self.observe(record["namespace"], record["version"])
+
+    def observe(self, namespace: str, version: int) -> None:
+        """Record a version seen for a namespace, ignoring out-of-order updates"""
+        if version > self.versions.get(namespace, -1):
+            self.versions[namespace] = version
+
+    async def bump(self, conn: asyncpg.Connection, namespace: str) -> Optional[int]:
+        """
+        Bump a namespace from inside a writer's transaction and return the new
+        version. Pass it to observe() once the transaction has committed, so
+        this worker serves the change right away; observing it any earlier
+        would let a concurrent read cache pre-commit data under the new key.
+        """
+        return await conn.fetchval(BUMP_VERSION_SQL, namespace)
+
+    async def listen(self, dsn: str) -> None:
+        """Follow version bumps published by other workers and the scraper"""
+        self._dsn = dsn
+        try:
+            await self._connect()
+        except Exception as e:
+            logger.error(f"Failed to listen for cache invalidations: {str(e)}")
+            self._schedule_reconnect()
+
+    async def _connect(self) -> None:
+        conn = await asyncpg.connect(self._dsn)
+        try:
+            await conn.add_listener(CHANNEL, self._on_notification)
+            for channel, callback in self._subscriptions.items():
+                await conn.add_listener(channel, callback)
+        except Exception:
+            await conn.close()
+            raise
+        conn.add_termination_listener(self._on_termination)
+        self._listener_conn = conn
+        logger.info(f"Listening for cache invalidations on '{CHANNEL}'")
+
+    def _schedule_reconnect(self) -> None:
+        if self._closing or (self._reconnect_task is not None and not self._reconnect_task.done()):
+            return
+        self._reconnect_task = asyncio.ensure_future(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        delay = RECONNECT_INITIAL_SECONDS
+        while not self._closing:
+            await asyncio.sleep(delay)
+            try:
+                await self._connect()
+                # Bumps published while disconnected were never delivered
+                await self.load(self._listener_conn)
+                logger.info("Cache invalidation listener reconnected")
+                return
+            except Exception as e:
+                logger.warning(f"Failed to reconnect cache invalidation listener: {str(e)}")
+                delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+
+    async def poll(self, pool: asyncpg.Pool, interval: float = 30) -> None:
+        """
+        Re-read all versions every interval seconds, a fallback for
+        notifications lost while the listener is down or reconnecting
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with pool.acquire() as conn:
+                    await self.load(conn)
+            except Exception as e:
+                logger.warning(f"Failed to poll cache versions: {str(e)}")
+
+    async def subscribe(self, channel: str, callback: Callable) -> None:
+        """Also deliver notifications on another channel to callback"""
+        self._subscriptions[channel] = callback
+        if self._listener_conn is None or self._listener_conn.is_closed():
+            # Added when the listener (re)connects
+            logger.warning(f"Not listening for cache invalidations yet, '{channel}' will be subscribed on reconnect")
+            return
+        await self._listener_conn.add_listener(channel, callback)
+
+    async def close(self) -> None:
+        self._closing = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+        if self._listener_conn is not None and not self._listener_conn.is_closed():
+            await self._listener_conn.close()
+
+    def _on_notification(self, conn, pid, channel, payload: str) -> None:
+        try:
+            namespace, version = payload.rsplit(":", 1)
+            self.observe(namespace, int(version))
+            logger.info(f"Cache namespace '{namespace}' is now at version {version}")
+        except ValueError:
+            logger.warning(f"Ignoring malformed cache invalidation payload: {payload!r}")
+
+    def _on_termination(self, conn) -> None:
+        if self._closing:
+            return
+        logger.warning("Cache invalidation listener disconnected, reconnecting")
+        self._schedule_reconnect()
+
+    def version_tag(self, cache_name: str) -> str:
+        """Current versions of the data a cache namespace depends on"""
+        return ":".join(
+            f"{dep}{self.versions.get(dep, 0)}"
+            for dep in self.dependencies.get(cache_name, ())
+        )
+
+    def etag(self, cache_name: str, resource: str, extra: Iterable[str] = ()) -> str:
+        """
+        Strong ETag for a resource served from a cache namespace. A response
+        is fully determined by its URL and the data versions it depends on,
+        so the tag can be computed, and compared, before doing any work.
+        extra names data added to the cached response on every request.
+        """
+        extra_tag = ":".join(f"{dep}{self.versions.get(dep, 0)}" for dep in extra)
+        digest = hashlib.md5(
+            f"{self.version_tag(cache_name)}:{extra_tag}:{resource}".encode()
+        ).hexdigest()
+        return f'"{digest}"'
+
+    def key_builder(
+        self,
+        func: Callable,
+        namespace: str = "",
+        *,
+        request: Optional[Request] = None,
+        response: Optional[Response] = None,
+        args: tuple = (),
+        kwargs: Optional[dict] = None,
+    ) -> str:
+        """fastapi-cache key builder that prefixes keys with data versions"""
+        cache_name = namespace.rsplit(":", 1)[-1]
+        version_tag = self.version_tag(cache_name)
+        digest = hashlib.md5(
+            f"{func.__module__}:{func.__name__}:{args}:{kwargs}".encode()
+        ).hexdigest()
+        return f"{namespace}:{version_tag}:{digest}"
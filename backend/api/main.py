@@ -1,9 +1,16 @@
 import os
+import json
+import math
 import time
+import asyncio
+import base64
 import logging
 import asyncpg
-from typing import List, Optional
-from fastapi import FastAPI, HTTPException, Query, Body
+import orjson
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+from fastapi import FastAPI, HTTPException, Query, Body, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
@@ -13,8 +20,25 @@ import uuid
 from fastapi_cache import FastAPICache
 from fastapi_cache.backends.redis import RedisBackend
 from fastapi_cache.decorator import cache
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from redis import asyncio as aioredis
 
+from schema import apply_migrations, check_schema
+from metrics import REQUEST_LATENCY, InstrumentedConnection, InstrumentedPool, statement
+from invalidation import CacheVersions
+from cache import (
+    JSONBytesCoder,
+    JSONBytesResponse,
+    LRUCache,
+    QueryNormalizer,
+    SingleFlight,
+    TwoTierBackend,
+)
+from compression import COMPRESSIBLE_TYPES, ResponseCompressor, strip_encoding_suffix
+from suggest import PrefixIndex
+from warming import WARM_CHANNEL, CacheWarmer, QueryStats
+from engine import SearchEngine, tsquery_lexemes
+
 
 load_dotenv()
 
@@ -27,12 +51,96 @@ logging.basicConfig(
 )
 logger = logging.getLogger("api")
 
+# Cache namespaces and the data each depends on. Writers bump the data
+# versions, which moves every dependent endpoint to fresh cache keys.
+cache_versions = CacheVersions({
+    "search": ["perspectives"],
+    "recent": ["perspectives"],
+    "stats": ["perspectives"],
+})
+
+# Data filled into cached responses on every request instead of being part of
+# the cache key, so comments don't empty the search and recent caches. ETags
+# still cover it, so clients see new counts.
+HYDRATED_DATA = {
+    "search": ["comments"],
+    "recent": ["comments"],
+}
+
+# Server-side cache TTLs per namespace. Versioned keys make long TTLs safe.
+CACHE_TTLS = {
+    "search": 86400,
+    "recent": 86400,
+    "stats": 86400,
+}
+
+# How long browsers and edge caches may reuse a read response without
+# revalidating. Revalidation is a cheap 304 (see conditional_get), and within
+# the cache TTL edge caches may keep serving while they revalidate.
+HTTP_MAX_AGE = int(os.environ.get("HTTP_MAX_AGE", "60"))
+
+# Negotiated gzip/brotli for responses of at least COMPRESSION_MIN_BYTES,
+# with compressed bodies of ETagged responses cached by ETag
+response_compressor = ResponseCompressor(
+    min_bytes=int(os.environ.get("COMPRESSION_MIN_BYTES", "1024")),
+    cache=LRUCache(
+        max_entries=int(os.environ.get("COMPRESSION_CACHE_MAX_ENTRIES", "1024")),
+        max_bytes=int(os.environ.get("COMPRESSION_CACHE_MAX_MB", "32")) * 1024 * 1024
+    )
+)
+
+# Read routes answered with ETags and 304s, and the cache namespace each
+# one is served from
+CONDITIONAL_ROUTES = {
+    "/api/perspectives": "search",
+    "/api/perspectives/stats": "stats",
+    "/api/recent": "recent",
+}
+
+# Query parameter values FastAPI parses as True for a bool parameter
+TRUTHY_PARAMS = {"1", "true", "on", "yes", "t", "y"}
+
+# Shares one database query between concurrent identical cache misses
+request_coalescer = SingleFlight()
+
+# Maps raw search strings to the tsquery they search for, for cache keys
+query_normalizer = QueryNormalizer(coalescer=request_coalescer)
+
+# How often each search is asked for, to pick what to warm after a scrape
+query_stats = QueryStats()
+
+# Where searches run: "postgres" (default) queries the GIN index for every
+# cache miss, "memory" serves them from an in-process BM25 index and only
+# reads comment counts from Postgres
+SEARCH_BACKEND = os.environ.get("SEARCH_BACKEND", "postgres")
+if SEARCH_BACKEND not in ("postgres", "memory"):
+    raise RuntimeError(f"Unknown SEARCH_BACKEND '{SEARCH_BACKEND}', expected 'postgres' or 'memory'")
+search_engine = SearchEngine() if SEARCH_BACKEND == "memory" else None
+
+# In-memory typeahead over recent titles, served without touching Postgres
+suggest_index = PrefixIndex(max_titles=int(os.environ.get("SUGGEST_MAX_TITLES", "50000")))
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Initialize Redis cache
+    # Initialize the cache: in-process LRU in front of Redis when configured
+    l1 = LRUCache(
+        max_entries=int(os.environ.get("L1_CACHE_MAX_ENTRIES", "1024")),
+        max_bytes=int(os.environ.get("L1_CACHE_MAX_MB", "64")) * 1024 * 1024
+    )
     redis_url = os.environ.get("REDIS_URL")
-    redis = aioredis.from_url(redis_url)
-    FastAPICache.init(RedisBackend(redis), prefix="fastapi-cache")
+    if redis_url:
+        redis_client = aioredis.from_url(redis_url)
+        redis_backend = RedisBackend(redis_client)
+        query_stats.redis = redis_client
+    else:
+        logger.warning("REDIS_URL not set, caching in process memory only.")
+        redis_backend = None
+    FastAPICache.init(
+        TwoTierBackend(l1, redis_backend),
+        prefix="fastapi-cache",
+        coder=JSONBytesCoder,
+        key_builder=cache_versions.key_builder
+    )
     
     # Initialize PostgreSQL connection pool
     db_url = os.environ.get("NEON_DB_URL")
@@ -41,18 +149,56 @@ async def lifespan(app: FastAPI):
         raise RuntimeError("Database URL not configured.")
     try:
         t1 = time.time()
-        app.state.pool = await asyncpg.create_pool(
+        pool = await asyncpg.create_pool(
             dsn=db_url,
             min_size=1,
-            max_size=10
+            max_size=10,
+            connection_class=InstrumentedConnection
         )
+        app.state.pool = InstrumentedPool(pool)
         logger.info("Database connection pool initialized.")
     except Exception as e:
         logger.error(f"Failed to initialize database pool: {e}")
         raise RuntimeError(f"Failed to initialize database pool: {e}")
 
+    # Bring the schema up to date before serving any requests
+    async with app.state.pool.acquire() as conn:
+        applied = await apply_migrations(conn)
+        if applied:
+            logger.info(f"Applied migrations: {', '.join(applied)}")
+        await check_schema(conn)
+        await cache_versions.load(conn)
+
+    await cache_versions.listen(db_url)
+    await cache_versions.subscribe(WARM_CHANNEL, cache_warmer.on_notification)
+    # Catches bumps whose notifications were lost while the listener was down
+    version_poller = asyncio.create_task(cache_versions.poll(
+        app.state.pool, float(os.environ.get("CACHE_VERSION_POLL_SECONDS", "30"))
+    ))
+    query_stats_flusher = asyncio.create_task(query_stats.flush_periodically())
+
+    if search_engine is not None:
+        await search_engine.build(app.state.pool, cache_versions.versions.get("perspectives"))
+
+    # Build the typeahead index, then rebuild it after the scraper adds articles
+    try:
+        await suggest_index.refresh(app.state.pool, cache_versions.versions.get("perspectives"))
+    except Exception as e:
+        # Suggestions stay empty until the next rebuild; search still works
+        logger.error(f"Failed to build suggestion index: {str(e)}")
+    suggest_refresher = asyncio.create_task(suggest_index.keep_fresh(
+        app.state.pool,
+        lambda: cache_versions.versions.get("perspectives"),
+        min_interval=float(os.environ.get("SUGGEST_REFRESH_SECONDS", "300"))
+    ))
+
     yield
     
+    suggest_refresher.cancel()
+    query_stats_flusher.cancel()
+    version_poller.cancel()
+    await cache_versions.close()
+
     # Clean up the pool when the app shuts down
     if hasattr(app.state, 'pool') and app.state.pool:
         await app.state.pool.close()
@@ -62,9 +208,121 @@ async def lifespan(app: FastAPI):
 app = FastAPI(
     title="Full Picture API",
     description="API for retrieving news perspectives",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
+def matching_etag(header: str, etag: str) -> Optional[str]:
+    """
+    The entity tag in an If-None-Match header that matches etag (weak
+    comparison, ignoring a compressed representation's suffix), if any
+    """
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return etag
+        if strip_encoding_suffix(candidate.removeprefix("W/")) == etag:
+            return candidate
+    return None
+
+
+@app.middleware("http")
+async def conditional_get(request: Request, call_next):
+    """
+    Strong ETags and Cache-Control for CONDITIONAL_ROUTES. The ETag comes from
+    the URL and the current data versions, so a matching If-None-Match is
+    answered with 304 before any cache lookup or query runs. Streamed
+    searches aren't cached and get neither.
+    """
+    cache_name = CONDITIONAL_ROUTES.get(request.url.path)
+    if request.method != "GET" or cache_name is None:
+        return await call_next(request)
+
+    if request.query_params.get("stream", "").lower() in TRUTHY_PARAMS:
+        response = await call_next(request)
+        response.headers["Cache-Control"] = "no-store"
+        return response
+
+    query = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    etag = cache_versions.etag(
+        cache_name, f"{request.url.path}?{query}", extra=HYDRATED_DATA.get(cache_name, ())
+    )
+    headers = {
+        "ETag": etag,
+        "Cache-Control": (
+            f"public, max-age={HTTP_MAX_AGE}, "
+            f"stale-while-revalidate={CACHE_TTLS[cache_name]}"
+        ),
+        "Vary": "Accept-Encoding",
+    }
+
+    client_etags = request.headers.get("if-none-match")
+    matched = matching_etag(client_etags, etag) if client_etags else None
+    if matched is not None:
+        # Echo the client's tag, which names the encoding it has cached
+        return Response(status_code=304, headers={**headers, "ETag": matched})
+
+    response = await call_next(request)
+    if response.status_code == 200:
+        # Replaces the per-process weak ETag set by @cache
+        response.headers.update(headers)
+    return response
+
+
+@app.middleware("http")
+async def compress_response(request: Request, call_next):
+    """
+    Compress response bodies with the best encoding the client accepts.
+    Runs outside conditional_get, so 304s pass through untouched and the
+    ETag it set can key the compressed body cache.
+    """
+    response = await call_next(request)
+    encoding = response_compressor.negotiate(request.headers.get("accept-encoding", ""))
+    content_type = response.headers.get("content-type", "")
+    if (
+        encoding is None
+        or response.status_code != 200
+        or "content-encoding" in response.headers
+        or not content_type.startswith(COMPRESSIBLE_TYPES)
+        or int(response.headers.get("content-length", 0)) < response_compressor.min_bytes
+    ):
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    headers = dict(response.headers)
+    headers["vary"] = "Accept-Encoding"
+
+    etag = response.headers.get("etag")
+    compressed = await response_compressor.compress(body, encoding, etag)
+    headers["content-encoding"] = encoding
+    headers["content-length"] = str(len(compressed))
+    if etag and not etag.startswith("W/"):
+        # Each encoding is a different representation, so it gets its own tag
+        headers["etag"] = f'{etag[:-1]}-{encoding}"'
+    return Response(content=compressed, status_code=response.status_code, headers=headers)
+
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+    # Label by route template to keep cardinality bounded
+    route = request.scope.get("route")
+    if route is not None:
+        path = route.path
+    elif request.url.path in CONDITIONAL_ROUTES:
+        # 304s from conditional_get are answered before routing; these
+        # paths have no parameters, so the path is the route template
+        path = request.url.path
+    else:
+        path = "unmatched"
+    REQUEST_LATENCY.labels(request.method, path, response.status_code).observe(
+        time.perf_counter() - start
+    )
+    return response
+
+
+# Added last so it wraps the other middleware and 304s get CORS headers too
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"], 
@@ -97,51 +355,295 @@ class CommentCreate(BaseModel):
     content: str = Field(..., min_length=1, max_length=500)
 
 
-@app.get("/api/perspectives", response_model=List[Perspective])
-@cache(expire=300) 
+# Upper bounds for the batch endpoints
+MAX_BATCH_IDS = 100
+MAX_COMMENTS_PER_PERSPECTIVE = 100
+
+
+class CommentBatchRequest(BaseModel):
+    perspective_ids: List[str] = Field(..., min_length=1, max_length=MAX_BATCH_IDS)
+    limit_per_perspective: int = Field(20, ge=1, le=MAX_COMMENTS_PER_PERSPECTIVE)
+
+
+class CommentCountsRequest(BaseModel):
+    perspective_ids: List[str] = Field(..., min_length=1, max_length=MAX_BATCH_IDS)
+
+
+class PerspectivePage(BaseModel):
+    results: List[Perspective]
+    next_cursor: Optional[str] = None
+
+
+class CommunityStats(BaseModel):
+    count: int
+    mean_sentiment: Optional[float] = None
+    histogram: List[int]
+
+
+class PerspectiveStats(BaseModel):
+    total: int
+    sentiment_bins: List[float]
+    communities: Dict[str, CommunityStats]
+    sources: Dict[str, int]
+
+
+def encode_search_cursor(rank: float, perspective_id: str) -> str:
+    """Encode the (rank, id) keyset position of the last row on a page"""
+    payload = json.dumps([rank, perspective_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor: str) -> Tuple[float, str]:
+    """Decode a cursor produced by encode_search_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, perspective_id = json.loads(base64.urlsafe_b64decode(padded))
+        return float(rank), str(perspective_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# Ranked full-text search, keyset-paginated on (rank, id).
+# $1 normalized tsquery text (see QueryNormalizer), $2/$3 rank and id of the last row already seen, $4 limit (NULL for all)
+SEARCH_SQL = statement("search", """
+    SELECT id, title, source, community, quote, sentiment, date, url, comment_count, rank
+    FROM (
+        SELECT 
+            p.id::text AS id, p.title, p.source, p.community, p.quote, p.sentiment, 
+            SPLIT_PART(p.created_at::text, ' ', 1) as date, 
+            p.url,
+            p.comment_count,
+            ts_rank_cd(p.search_vector, search_query) AS rank
+        FROM perspectives p
+        CROSS JOIN CAST($1::text AS tsquery) AS search_query
+        WHERE p.search_vector @@ search_query
+    ) ranked
+    WHERE $2::real IS NULL OR (rank, id) < ($2::real, $3::text)
+    ORDER BY rank DESC, id DESC
+    LIMIT $4
+""")
+
+# Every match for stream mode, in no particular order: without an ORDER BY
+# rows are sent as the index scan finds them, instead of after every match
+# has been ranked and sorted. A cursor still skips the matches ranked at or
+# above it.
+STREAM_SQL = statement("search_stream", """
+    SELECT id, title, source, community, quote, sentiment, date, url, comment_count
+    FROM (
+        SELECT
+            p.id::text AS id, p.title, p.source, p.community, p.quote, p.sentiment,
+            SPLIT_PART(p.created_at::text, ' ', 1) as date,
+            p.url,
+            p.comment_count,
+            ts_rank_cd(p.search_vector, search_query) AS rank
+        FROM perspectives p
+        CROSS JOIN CAST($1::text AS tsquery) AS search_query
+        WHERE p.search_vector @@ search_query
+    ) ranked
+    WHERE $2::real IS NULL OR (rank, id) < ($2::real, $3::text)
+""")
+
+# Default page size, which is also the page warmed after a scrape
+SEARCH_PAGE_SIZE = 50
+
+# Rows fetched per round trip from the server-side cursor in stream mode
+STREAM_PREFETCH = 200
+
+# A stream holds a pool connection, inside a transaction, until the client has
+# read it all. At most MAX_CONCURRENT_STREAMS run at once so slow exports can't
+# take the connections every other endpoint needs. Postgres ends a stream whose
+# client stalls for STREAM_IDLE_TIMEOUT_SECONDS between fetches, and streams
+# are cut off after STREAM_MAX_SECONDS.
+MAX_CONCURRENT_STREAMS = int(os.environ.get("MAX_CONCURRENT_STREAMS", "2"))
+STREAM_IDLE_TIMEOUT_SECONDS = int(os.environ.get("STREAM_IDLE_TIMEOUT_SECONDS", "30"))
+STREAM_MAX_SECONDS = float(os.environ.get("STREAM_MAX_SECONDS", "300"))
+stream_slots = asyncio.Semaphore(MAX_CONCURRENT_STREAMS)
+
+
+def perspective_from_record(record: asyncpg.Record) -> dict:
+    """Convert a perspectives row into the Perspective response shape"""
+    return {
+        "id": str(record["id"]),
+        "title": record["title"],
+        "source": record["source"],
+        "community": record["community"],
+        "quote": record["quote"],
+        "sentiment": float(record["sentiment"]),
+        "date": record["date"],
+        "url": record["url"],
+        "comment_count": int(record["comment_count"])
+    }
+
+
+# Current comment counts of the perspectives in a cached response
+COMMENT_COUNTS_SQL = statement("comment_counts", """
+    SELECT id, comment_count FROM perspectives WHERE id = ANY($1)
+""")
+
+
+async def with_current_comment_counts(perspectives: List[dict]) -> List[dict]:
+    """
+    Replace the comment counts in cached perspectives with current ones, in
+    one primary key lookup. If it fails the cached counts are served.
+    """
+    if not perspectives:
+        return perspectives
+    try:
+        async with app.state.pool.acquire() as conn:
+            records = await conn.fetch(
+                COMMENT_COUNTS_SQL, [perspective["id"] for perspective in perspectives]
+            )
+    except Exception as e:
+        logger.warning(f"Serving cached comment counts, lookup failed: {str(e)}")
+        return perspectives
+    counts = {str(record["id"]): int(record["comment_count"]) for record in records}
+    for perspective in perspectives:
+        perspective["comment_count"] = counts.get(perspective["id"], perspective["comment_count"])
+    return perspectives
+
+
+def with_cache_headers(result: Response, response: Response) -> Response:
+    """
+    Copy headers @cache set on the injected response (Cache-Control, ETag,
+    cache status) onto a response the endpoint returns directly
+    """
+    if result is not response:
+        for name, value in response.headers.items():
+            result.headers[name] = value
+    return result
+
+
+def comment_from_record(record: asyncpg.Record) -> dict:
+    """Convert a comments row into the Comment response shape"""
+    return {
+        "id": str(record["id"]),
+        "perspective_id": str(record["perspective_id"]),
+        "content": record["content"],
+        "created_at": record["created_at"].isoformat() if record["created_at"] else None
+    }
+
+
+@app.get("/api/perspectives", response_model=PerspectivePage)
 async def get_perspectives(
-    query: str = Query(..., description="Search query for full-text search")
+    request: Request,
+    response: Response,
+    query: str = Query(..., description="Search query for full-text search"),
+    limit: int = Query(SEARCH_PAGE_SIZE, ge=1, le=200, description="Maximum number of results per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    stream: bool = Query(False, description="Stream every match as NDJSON instead of a page")
 ):
     """
     Get perspectives based on PostgreSQL Full-Text Search 
     across 'title' and 'quote' fields using asyncpg.
-    Results are ranked by relevance and include comment counts.
+    Matches come from the GIN-indexed search_vector column, where titles
+    are weighted above quotes. Results are ranked by relevance and include
+    comment counts.
+    Results are paginated with a keyset cursor on (rank, id), so later pages
+    cost the same as the first one.
+    With SEARCH_BACKEND=memory, pages are ranked with BM25 by the in-process
+    search engine instead, and only comment counts are read from Postgres.
+    With stream=true, every match after the cursor is streamed as
+    application/x-ndjson (one Perspective per line, unranked) and limit is
+    ignored.
     """
+    after_rank, after_id = decode_search_cursor(cursor) if cursor else (None, None)
+
     try:
-        logger.info(f"Starting request for query: '{query}'")
+        tsquery = await query_normalizer.normalize(app.state.pool, query)
+    except asyncpg.PostgresError as e:
+        logger.error(f"Database query error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
+
+    if stream:
+        if stream_slots.locked():
+            raise HTTPException(status_code=503, detail="Too many concurrent streams, try again later")
+        # Never waits: the semaphore isn't locked, and nothing ran since the check
+        await stream_slots.acquire()
+        released = False
+
+        def release_slot():
+            nonlocal released
+            if not released:
+                released = True
+                stream_slots.release()
+
+        # The stream releases its slot when it ends; the background task
+        # covers a client that disconnects before the stream starts
+        return StreamingResponse(
+            stream_perspectives(tsquery, after_rank, after_id, release_slot),
+            media_type="application/x-ndjson",
+            background=BackgroundTask(release_slot)
+        )
+
+    if cursor is None:
+        query_stats.record(tsquery)
+
+    page = await search_perspectives(
+        tsquery=tsquery,
+        limit=limit,
+        after_rank=after_rank,
+        after_id=after_id,
+        request=request,
+        response=response
+    )
+    body = orjson.loads(page.body)
+    body["results"] = await with_current_comment_counts(body["results"])
+    return with_cache_headers(JSONBytesResponse(content=orjson.dumps(body)), response)
+
+
+@cache(expire=CACHE_TTLS["search"], namespace="search")
+async def search_perspectives(
+    tsquery: str,
+    limit: int,
+    after_rank: Optional[float],
+    after_id: Optional[str],
+    request: Request,
+    response: Response
+):
+    """
+    Fetch one page of search results. Kept separate from the route so that
+    stream mode bypasses the cache, and keyed on the normalized tsquery so
+    spelling variants of a query share an entry.
+    """
+    if not tsquery:
+        # Only stop words, nothing can match
+        return JSONBytesResponse(content=orjson.dumps({"results": [], "next_cursor": None}))
+
+    body = await request_coalescer.do(
+        # A request after a version bump must not join a query started before it
+        ("search", cache_versions.version_tag("search"), tsquery, limit, after_rank, after_id),
+        lambda: fetch_search_page(tsquery, limit, after_rank, after_id)
+    )
+    return JSONBytesResponse(content=body)
+
+
+async def fetch_search_page(
+    tsquery: str,
+    limit: int,
+    after_rank: Optional[float],
+    after_id: Optional[str]
+) -> bytes:
+    """Run the search query for one page of results, encoded as JSON"""
+    try:
+        logger.info(f"Starting request for query: '{tsquery}'")
+
+        lexemes = tsquery_lexemes(tsquery) if search_engine is not None else None
+        if lexemes is not None:
+            return await fetch_engine_search_page(lexemes, limit, after_rank, after_id)
 
         async with app.state.pool.acquire() as conn:
-            sql = """
-                SELECT 
-                    p.id, p.title, p.source, p.community, p.quote, p.sentiment, 
-                    SPLIT_PART(p.created_at::text, ' ', 1) as date, 
-                    p.url,
-                    COALESCE(COUNT(c.id), 0) as comment_count,
-                    ts_rank_cd(to_tsvector('english', p.title || ' ' || p.quote), plainto_tsquery('english', $1)) AS rank
-                FROM perspectives p
-                LEFT JOIN comments c ON p.id = c.perspective_id
-                WHERE to_tsvector('english', p.title || ' ' || p.quote) @@ plainto_tsquery('english', $1)
-                GROUP BY p.id, p.title, p.source, p.community, p.quote, p.sentiment, p.created_at, p.url
-                ORDER BY rank DESC
-            """
+            # Fetch one extra row to find out whether there is a next page
+            records = await conn.fetch(SEARCH_SQL, tsquery, after_rank, after_id, limit + 1)
             
-            records = await conn.fetch(sql, query)
+            next_cursor = None
+            if len(records) > limit:
+                records = records[:limit]
+                last = records[-1]
+                next_cursor = encode_search_cursor(float(last["rank"]), last["id"])
             
-            perspectives = [
-                {
-                    "id": str(record["id"]),
-                    "title": record["title"],
-                    "source": record["source"],
-                    "community": record["community"],
-                    "quote": record["quote"],
-                    "sentiment": float(record["sentiment"]),
-                    "date": record["date"],
-                    "url": record["url"],
-                    "comment_count": int(record["comment_count"])
-                } for record in records
-            ]
+            perspectives = [perspective_from_record(record) for record in records]
             
-            return perspectives
+            return orjson.dumps({"results": perspectives, "next_cursor": next_cursor})
     
     except asyncpg.PostgresError as e:
         logger.error(f"Database query error: {str(e)}")
@@ -151,36 +653,272 @@ async def get_perspectives(
         raise HTTPException(status_code=500, detail=f"Error fetching perspectives: {str(e)}")
 
 
-@app.get("/api/perspectives/{perspective_id}/comments", response_model=List[Comment])
-async def get_comments(perspective_id: str):
+async def fetch_engine_search_page(
+    lexemes: List[str],
+    limit: int,
+    after_rank: Optional[float],
+    after_id: Optional[str]
+) -> bytes:
+    """fetch_search_page served from the in-process search engine"""
+    await search_engine.catch_up(app.state.pool, cache_versions.versions.get("perspectives"))
+
+    # Fetch one extra row to find out whether there is a next page
+    ranked = search_engine.search(lexemes, limit + 1, after_rank, after_id)
+    next_cursor = None
+    if len(ranked) > limit:
+        ranked = ranked[:limit]
+        last_rank, last = ranked[-1]
+        next_cursor = encode_search_cursor(last_rank, last["id"])
+
+    # Comment counts are filled in by get_perspectives
+    perspectives = [{**perspective, "comment_count": 0} for _, perspective in ranked]
+    return orjson.dumps({"results": perspectives, "next_cursor": next_cursor})
+
+
+async def stream_perspectives(
+    tsquery: str,
+    after_rank: Optional[float],
+    after_id: Optional[str],
+    release_slot: Callable[[], None]
+) -> AsyncIterator[bytes]:
     """
-    Get all comments for a specific perspective
+    Yield search results as NDJSON lines from a server-side cursor, so only
+    STREAM_PREFETCH rows are held in memory at a time. A stream cut short
+    ends with an {"error": ...} line instead of a perspective.
     """
+    if not tsquery:
+        release_slot()
+        return
+
+    logger.info(f"Starting stream for query: '{tsquery}'")
+    count = 0
     try:
         async with app.state.pool.acquire() as conn:
-            sql = """
-                SELECT id, perspective_id, content, created_at
-                FROM comments
-                WHERE perspective_id = $1
-                ORDER BY created_at DESC
-            """
-            
-            records = await conn.fetch(sql, perspective_id)
+            # Server-side cursors only live inside a transaction
+            async with conn.transaction(readonly=True):
+                # Bounds each fetch, and how long a slow client can leave the
+                # transaction idle between fetches
+                await conn.execute(
+                    f"SET LOCAL statement_timeout = {STREAM_IDLE_TIMEOUT_SECONDS * 1000}"
+                )
+                await conn.execute(
+                    f"SET LOCAL idle_in_transaction_session_timeout = {STREAM_IDLE_TIMEOUT_SECONDS * 1000}"
+                )
+                deadline = time.monotonic() + STREAM_MAX_SECONDS
+                async for record in conn.cursor(
+                    STREAM_SQL, tsquery, after_rank, after_id, prefetch=STREAM_PREFETCH
+                ):
+                    if time.monotonic() > deadline:
+                        logger.warning(f"Stream for query '{tsquery}' hit the {STREAM_MAX_SECONDS:.0f}s limit after {count} rows")
+                        yield orjson.dumps({
+                            "error": "truncated",
+                            "detail": f"Stream time limit of {STREAM_MAX_SECONDS:.0f}s reached after {count} results",
+                        }) + b"\n"
+                        return
+                    count += 1
+                    yield orjson.dumps(perspective_from_record(record)) + b"\n"
+        logger.info(f"Streamed {count} perspectives for query: '{tsquery}'")
+    except Exception as e:
+        # Headers are already sent, so the error goes in the stream itself
+        logger.error(f"Error streaming perspectives after {count} rows: {str(e)}")
+        yield orjson.dumps({
+            "error": "failed",
+            "detail": f"Stream failed after {count} results",
+        }) + b"\n"
+    finally:
+        release_slot()
+
+
+# Sentiment histogram buckets, evenly spaced over [-1, 1]
+SENTIMENT_BUCKETS = 10
+
+# Search matches aggregated by community, source and sentiment bucket in one
+# pass over the GIN index; at most communities x sources x buckets rows.
+# $1 normalized tsquery text, $2 number of buckets
+STATS_SQL = statement("stats", """
+    SELECT
+        p.community,
+        p.source,
+        LEAST(GREATEST(width_bucket(p.sentiment, -1, 1, $2), 1), $2) AS bucket,
+        COUNT(*) AS count,
+        SUM(p.sentiment) AS sentiment_sum
+    FROM perspectives p
+    CROSS JOIN CAST($1::text AS tsquery) AS search_query
+    WHERE p.search_vector @@ search_query
+    GROUP BY p.community, p.source, bucket
+""")
+
+
+def sentiment_bucket(sentiment: float) -> int:
+    """The 1-based STATS_SQL bucket a sentiment falls in, computed like width_bucket"""
+    bucket = math.floor((sentiment + 1) * SENTIMENT_BUCKETS / 2) + 1
+    return min(max(bucket, 1), SENTIMENT_BUCKETS)
+
+
+def summarize_stats(groups) -> dict:
+    """
+    Roll (community, source, bucket, count, sentiment_sum) groups up into
+    the PerspectiveStats response shape
+    """
+    communities: Dict[str, dict] = {}
+    sources: Dict[str, int] = {}
+    sums: Dict[str, float] = {}
+    total = 0
+    for community, source, bucket, count, sentiment_sum in groups:
+        stats = communities.setdefault(
+            community, {"count": 0, "mean_sentiment": None, "histogram": [0] * SENTIMENT_BUCKETS}
+        )
+        stats["count"] += count
+        stats["histogram"][bucket - 1] += count
+        sums[community] = sums.get(community, 0.0) + sentiment_sum
+        sources[source] = sources.get(source, 0) + count
+        total += count
+    for community, stats in communities.items():
+        stats["mean_sentiment"] = sums[community] / stats["count"]
+    return {
+        "total": total,
+        "sentiment_bins": [round(-1 + 2 * i / SENTIMENT_BUCKETS, 6) for i in range(SENTIMENT_BUCKETS + 1)],
+        "communities": communities,
+        "sources": sources,
+    }
+
+
+@app.get("/api/perspectives/stats", response_model=PerspectiveStats)
+async def get_perspective_stats(
+    request: Request,
+    response: Response,
+    query: str = Query(..., description="Search query for full-text search")
+):
+    """
+    Summarize every perspective matching a search: per community the number
+    of matches, mean sentiment and a sentiment histogram (sentiment_bins
+    holds the bucket edges), plus the number of matches per source. Takes a
+    single aggregate query instead of downloading every match.
+    """
+    try:
+        tsquery = await query_normalizer.normalize(app.state.pool, query)
+    except asyncpg.PostgresError as e:
+        logger.error(f"Database query error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
+
+    stats = await cached_perspective_stats(tsquery=tsquery, request=request, response=response)
+    return with_cache_headers(stats, response)
+
+
+@cache(expire=CACHE_TTLS["stats"], namespace="stats")
+async def cached_perspective_stats(tsquery: str, request: Request, response: Response):
+    if not tsquery:
+        return JSONBytesResponse(content=orjson.dumps(summarize_stats([])))
+
+    body = await request_coalescer.do(
+        ("stats", cache_versions.version_tag("stats"), tsquery),
+        lambda: fetch_perspective_stats(tsquery)
+    )
+    return JSONBytesResponse(content=body)
+
+
+async def fetch_perspective_stats(tsquery: str) -> bytes:
+    """Run the stats aggregate for a query, encoded as JSON"""
+    try:
+        logger.info(f"Starting stats request for query: '{tsquery}'")
+
+        lexemes = tsquery_lexemes(tsquery) if search_engine is not None else None
+        if lexemes is not None:
+            # Aggregate in memory, without a database round trip
+            await search_engine.catch_up(app.state.pool, cache_versions.versions.get("perspectives"))
+            groups = [
+                (perspective["community"], perspective["source"],
+                 sentiment_bucket(perspective["sentiment"]), 1, perspective["sentiment"])
+                for _, perspective in search_engine.search(lexemes, None)
+            ]
+            return orjson.dumps(summarize_stats(groups))
+
+        async with app.state.pool.acquire() as conn:
+            records = await conn.fetch(STATS_SQL, tsquery, SENTIMENT_BUCKETS)
             
-            comments = [
-                {
-                    "id": str(record["id"]),
-                    "perspective_id": str(record["perspective_id"]),
-                    "content": record["content"],
-                    "created_at": record["created_at"].isoformat() if record["created_at"] else None
-                } for record in records
+            groups = [
+                (record["community"], record["source"], record["bucket"],
+                 int(record["count"]), float(record["sentiment_sum"]))
+                for record in records
             ]
+            return orjson.dumps(summarize_stats(groups))
+    
+    except asyncpg.PostgresError as e:
+        logger.error(f"Database query error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error fetching perspective stats: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error fetching perspective stats: {str(e)}")
+
+
+# Newest comments on a perspective, keyset-paginated on (created_at, id).
+# $2 is the id of the oldest comment already seen (NULL for the first page), $3 the limit
+COMMENTS_SQL = statement("comments", """
+    SELECT id, perspective_id, content, created_at
+    FROM comments
+    WHERE perspective_id = $1
+      AND ($2::timestamptz IS NULL OR (created_at, id) < ($2::timestamptz, $3::uuid))
+    ORDER BY created_at DESC, id DESC
+    LIMIT $4
+""")
+
+# Position of a before cursor, which must be a comment on the same perspective
+COMMENT_CURSOR_SQL = statement("comment_cursor", """
+    SELECT created_at, id FROM comments WHERE id = $1::uuid AND perspective_id = $2
+""")
+
+# Newest $2 comments for each perspective in $1
+COMMENTS_BATCH_SQL = statement("comments_batch", """
+    SELECT id, perspective_id, content, created_at
+    FROM (
+        SELECT
+            id, perspective_id, content, created_at,
+            ROW_NUMBER() OVER (PARTITION BY perspective_id ORDER BY created_at DESC, id DESC) AS rn
+        FROM comments
+        WHERE perspective_id = ANY($1)
+    ) ranked
+    WHERE rn <= $2
+    ORDER BY perspective_id, created_at DESC, id DESC
+""")
+
+
+@app.get("/api/perspectives/{perspective_id}/comments", response_model=List[Comment])
+async def get_comments(
+    perspective_id: str,
+    limit: int = Query(20, ge=1, le=MAX_COMMENTS_PER_PERSPECTIVE, description="Maximum number of comments"),
+    before: Optional[str] = Query(None, description="Only return comments older than the comment with this id")
+):
+    """
+    Get the newest comments for a specific perspective, a page at a time.
+    Pass the id of the oldest comment received as before to get the next
+    page; a page shorter than limit is the last one.
+    """
+    if before is not None:
+        try:
+            before = str(uuid.UUID(before))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    try:
+        async with app.state.pool.acquire() as conn:
+            after_created_at, after_id = None, None
+            if before is not None:
+                cursor = await conn.fetchrow(COMMENT_CURSOR_SQL, before, perspective_id)
+                if cursor is None:
+                    raise HTTPException(status_code=400, detail="Invalid cursor")
+                after_created_at, after_id = cursor["created_at"], cursor["id"]
+
+            records = await conn.fetch(COMMENTS_SQL, perspective_id, after_created_at, after_id, limit)
             
-            return comments
+            comments = [comment_from_record(record) for record in records]
+            
+            return JSONBytesResponse(content=orjson.dumps(comments))
     
     except asyncpg.PostgresError as e:
         logger.error(f"Database query error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
+    except HTTPException as e:
+        raise e
     except Exception as e:
         logger.error(f"Error fetching comments: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching comments: {str(e)}")
@@ -192,35 +930,43 @@ async def create_comment(perspective_id: str, comment: CommentCreate = Body(...)
     Create a new comment for a specific perspective
     """
     try:
-        # Validate that the perspective exists
         async with app.state.pool.acquire() as conn:
-            perspective = await conn.fetchrow(
-                "SELECT id FROM perspectives WHERE id = $1", perspective_id
-            )
-            
-            if not perspective:
-                raise HTTPException(status_code=404, detail="Perspective not found")
-            
-            # Generate a UUID for the comment
-            comment_id = str(uuid.uuid4())
-            
-            # Insert the comment
-            sql = """
-                INSERT INTO comments (id, perspective_id, content)
-                VALUES ($1, $2, $3)
-                RETURNING id, perspective_id, content, created_at
-            """
-            
-            record = await conn.fetchrow(
-                sql, comment_id, perspective_id, comment.content
-            )
+            async with conn.transaction():
+                # Bump the denormalized counter first; this also validates that
+                # the perspective exists and locks its row until we commit
+                perspective = await conn.fetchrow(
+                    """
+                    UPDATE perspectives
+                    SET comment_count = comment_count + 1
+                    WHERE id = $1
+                    RETURNING id
+                    """,
+                    perspective_id
+                )
+                
+                if not perspective:
+                    raise HTTPException(status_code=404, detail="Perspective not found")
+                
+                # Generate a UUID for the comment
+                comment_id = str(uuid.uuid4())
+                
+                # Insert the comment
+                sql = """
+                    INSERT INTO comments (id, perspective_id, content)
+                    VALUES ($1, $2, $3)
+                    RETURNING id, perspective_id, content, created_at
+                """
+                
+                record = await conn.fetchrow(
+                    sql, comment_id, perspective_id, comment.content
+                )
+
+                # Responses embed comment counts; move them to fresh ETags
+                version = await cache_versions.bump(conn, "comments")
             
-            return {
-                "id": str(record["id"]),
-                "perspective_id": str(record["perspective_id"]),
-                "content": record["content"],
-                "created_at": record["created_at"].isoformat() if record["created_at"] else None
-            }
+            if version is not None:
+                cache_versions.observe("comments", version)
+            return comment_from_record(record)
     
     except asyncpg.PostgresError as e:
         logger.error(f"Database query error: {str(e)}")
@@ -232,54 +978,124 @@ async def create_comment(perspective_id: str, comment: CommentCreate = Body(...)
         raise HTTPException(status_code=500, detail=f"Error creating comment: {str(e)}")
 
 
+@app.post("/api/comments/batch", response_model=Dict[str, List[Comment]])
+async def get_comments_batch(batch: CommentBatchRequest = Body(...)):
+    """
+    Get the newest comments for several perspectives in one query, capped at
+    limit_per_perspective each. Every requested id is present in the result,
+    with an empty list if it has no comments.
+    """
+    try:
+        async with app.state.pool.acquire() as conn:
+            records = await conn.fetch(
+                COMMENTS_BATCH_SQL, batch.perspective_ids, batch.limit_per_perspective
+            )
+            
+            comments: Dict[str, List[dict]] = {
+                perspective_id: [] for perspective_id in batch.perspective_ids
+            }
+            for record in records:
+                comment = comment_from_record(record)
+                comments.setdefault(comment["perspective_id"], []).append(comment)
+            
+            return JSONBytesResponse(content=orjson.dumps(comments))
+    
+    except asyncpg.PostgresError as e:
+        logger.error(f"Database query error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error fetching comment batch: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error fetching comment batch: {str(e)}")
+
+
+@app.post("/api/perspectives/counts", response_model=Dict[str, int])
+async def get_comment_counts(batch: CommentCountsRequest = Body(...)):
+    """
+    Get comment counts for several perspectives in one query. Ids that don't
+    match a perspective are left out of the result.
+    """
+    try:
+        async with app.state.pool.acquire() as conn:
+            records = await conn.fetch(COMMENT_COUNTS_SQL, batch.perspective_ids)
+            
+            counts = {str(record["id"]): int(record["comment_count"]) for record in records}
+            return JSONBytesResponse(content=orjson.dumps(counts))
+    
+    except asyncpg.PostgresError as e:
+        logger.error(f"Database query error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error fetching comment counts: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error fetching comment counts: {str(e)}")
+
+
+# Newest perspectives per community, read from the recent_perspectives
+# materialized view (refreshed by the scraper) through its
+# (community, created_at) index, then joined back to perspectives so
+# comment counts are current. $1 is the number of rows per community.
+RECENT_SQL = statement("recent", """
+    SELECT 
+        p.id, p.title, p.source, p.community, p.quote, p.sentiment,
+        SPLIT_PART(p.created_at::text, ' ', 1) as date,
+        p.url,
+        p.comment_count
+    FROM unnest(ARRAY['right', 'center', 'left']) AS c(community)
+    CROSS JOIN LATERAL (
+        SELECT r.id
+        FROM recent_perspectives r
+        WHERE r.community = c.community
+        ORDER BY r.created_at DESC
+        LIMIT $1
+    ) recent
+    JOIN perspectives p ON p.id = recent.id
+    ORDER BY p.community, p.created_at DESC
+""")
+
+# Rows per community kept in recent_perspectives (see migration 004)
+MAX_RECENT_PER_COMMUNITY = 20
+
+# Default rows per community, which is also what is warmed after a scrape
+RECENT_PER_COMMUNITY = 4
+
+
 @app.get("/api/recent", response_model=List[Perspective])
-@cache(expire=21600)
-async def get_recent_perspectives():
+async def get_recent_perspectives(
+    request: Request,
+    response: Response,
+    per_community: int = Query(RECENT_PER_COMMUNITY, ge=1, le=MAX_RECENT_PER_COMMUNITY, description="Perspectives per community")
+):
     """
     Get the most recent perspectives from each community (right, center, left)
     including comment counts
     """
+    recent = await cached_recent_perspectives(
+        per_community=per_community, request=request, response=response
+    )
+    perspectives = await with_current_comment_counts(orjson.loads(recent.body))
+    return with_cache_headers(JSONBytesResponse(content=orjson.dumps(perspectives)), response)
+
+
+@cache(expire=CACHE_TTLS["recent"], namespace="recent")
+async def cached_recent_perspectives(per_community: int, request: Request, response: Response):
+    body = await request_coalescer.do(
+        ("recent", cache_versions.version_tag("recent"), per_community),
+        lambda: fetch_recent_perspectives(per_community)
+    )
+    return JSONBytesResponse(content=body)
+
+
+async def fetch_recent_perspectives(per_community: int) -> bytes:
+    """Run the recent perspectives query, encoded as JSON"""
     try:
         logger.info("Starting request for recent perspectives")
 
         async with app.state.pool.acquire() as conn:
-            sql = """
-                WITH RankedPerspectives AS (
-                    SELECT 
-                        p.id, p.title, p.source, p.community, p.quote, p.sentiment,
-                        SPLIT_PART(p.created_at::text, ' ', 1) as date,
-                        p.url,
-                        COALESCE(COUNT(c.id), 0) as comment_count,
-                        ROW_NUMBER() OVER (PARTITION BY p.community ORDER BY p.created_at DESC) as rn
-                    FROM perspectives p
-                    LEFT JOIN comments c ON p.id = c.perspective_id
-                    WHERE p.community IN ('right', 'center', 'left')
-                    GROUP BY p.id, p.title, p.source, p.community, p.quote, p.sentiment, p.created_at, p.url
-                )
-                SELECT id, title, source, community, quote, sentiment, date, url, comment_count
-                FROM RankedPerspectives
-                WHERE rn <= 4
-                ORDER BY community, date DESC;
-            """
-            
-            records = await conn.fetch(sql)
+            records = await conn.fetch(RECENT_SQL, per_community)
             
-            perspectives = [
-                {
-                    "id": str(record["id"]),
-                    "title": record["title"],
-                    "source": record["source"],
-                    "community": record["community"],
-                    "quote": record["quote"],
-                    "sentiment": float(record["sentiment"]),
-                    "date": record["date"],
-                    "url": record["url"],
-                    "comment_count": int(record["comment_count"])
-                } for record in records
-            ]
+            perspectives = [perspective_from_record(record) for record in records]
             
             logger.info(f"Returning {len(perspectives)} perspectives")
-            return perspectives
+            return orjson.dumps(perspectives)
     
     except asyncpg.PostgresError as e:
         logger.error(f"Database query error: {str(e)}")
@@ -289,6 +1105,60 @@ async def get_recent_perspectives():
         raise HTTPException(status_code=500, detail=f"Error fetching recent perspectives: {str(e)}")
 
 
+# Upper bound on suggestions of each kind
+MAX_SUGGESTIONS = 20
+
+
+@app.get("/api/suggest")
+async def get_suggestions(
+    prefix: str = Query(..., max_length=100, description="What the user has typed so far"),
+    limit: int = Query(8, ge=1, le=MAX_SUGGESTIONS, description="Maximum terms and titles to return")
+):
+    """
+    Typeahead suggestions for the search box: the most common title words
+    starting with the last word of prefix, and the newest titles containing
+    such a word (and any earlier words of prefix). Served from an in-memory
+    index, so it is cheap enough to call on every keystroke.
+    """
+    return suggest_index.suggest(prefix, limit)
+
+
+async def warm_search(tsquery: str):
+    """Fill the cache for a query's first page and stats, as the frontend requests them"""
+    await search_perspectives(
+        tsquery=tsquery,
+        limit=SEARCH_PAGE_SIZE,
+        after_rank=None,
+        after_id=None,
+        request=None,
+        response=None
+    )
+    await cached_perspective_stats(tsquery=tsquery, request=None, response=None)
+
+
+async def warm_recent():
+    await cached_recent_perspectives(per_community=RECENT_PER_COMMUNITY, request=None, response=None)
+
+
+# Re-runs trending searches and /api/recent when the scraper finishes a run
+cache_warmer = CacheWarmer(
+    query_stats,
+    warm_query=warm_search,
+    warm_fixed=[warm_recent],
+    top_k=int(os.environ.get("CACHE_WARM_TOP_K", "50")),
+    concurrency=int(os.environ.get("CACHE_WARM_CONCURRENCY", "4"))
+)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """
+    Prometheus metrics: request latency per route, pool usage and acquire
+    wait, per-statement timings and row counts, cache lookups by result
+    """
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
@@ -0,0 +1,144 @@
+import os
+import re
+import time
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import asyncpg
+from prometheus_client import Counter, Gauge, Histogram
+
+
+logger = logging.getLogger("api.metrics")
+
+# Log statements slower than this many milliseconds (disabled when unset)
+SLOW_QUERY_MS = float(os.environ["SLOW_QUERY_MS"]) if os.environ.get("SLOW_QUERY_MS") else None
+
+REQUEST_LATENCY = Histogram(
+    "api_request_duration_seconds",
+    "Time spent handling HTTP requests",
+    ["method", "route", "status"],
+)
+POOL_SIZE = Gauge("api_db_pool_size", "Connections currently open in the asyncpg pool")
+POOL_MAX_SIZE = Gauge("api_db_pool_max_size", "Maximum size of the asyncpg pool")
+POOL_IN_USE = Gauge("api_db_pool_in_use", "Pool connections currently checked out")
+POOL_ACQUIRE_WAIT = Histogram(
+    "api_db_pool_acquire_seconds",
+    "Time spent waiting to acquire a pool connection",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+STATEMENT_DURATION = Histogram(
+    "api_db_statement_duration_seconds",
+    "Time spent executing database statements",
+    ["statement"],
+)
+ROWS_RETURNED = Histogram(
+    "api_db_rows_returned",
+    "Rows returned per database statement",
+    ["statement"],
+    buckets=(0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000),
+)
+CACHE_LOOKUPS = Counter(
+    "api_cache_lookups_total",
+    "Cache lookups by cache namespace and result (hit_l1, hit_redis, stale, miss)",
+    ["namespace", "result"],
+)
+COMPRESSED_RESPONSES = Counter(
+    "api_compressed_responses_total",
+    "Compressed response bodies by encoding and result (compressed, cache_hit)",
+    ["encoding", "result"],
+)
+CACHE_WARM_DURATION = Histogram(
+    "api_cache_warm_seconds",
+    "Time spent re-filling the cache after a scraper run",
+    buckets=(0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+COALESCED_REQUESTS = Counter(
+    "api_coalesced_requests_total",
+    "Requests that awaited an identical in-flight query instead of running it",
+)
+
+# SQL text -> metric label, filled in by statement()
+_statement_names: Dict[str, str] = {}
+
+
+def statement(name: str, sql: str) -> str:
+    """Register a name for a SQL statement's metrics and slow-query logs"""
+    _statement_names[sql] = name
+    return sql
+
+
+def normalize_sql(sql: str) -> str:
+    return " ".join(sql.split())
+
+
+def statement_name(sql: str) -> str:
+    """Name of a registered statement, otherwise '<verb> <table>'"""
+    name = _statement_names.get(sql)
+    if name is not None:
+        return name
+    normalized = normalize_sql(sql)
+    verb = normalized.split(" ", 1)[0].lower() if normalized else "unknown"
+    table = re.search(r"\b(?:FROM|INTO|UPDATE)\s+(\w+)", normalized, re.IGNORECASE)
+    return f"{verb} {table.group(1)}" if table else verb
+
+
+class InstrumentedConnection(asyncpg.Connection):
+    """
+    asyncpg connection that records execution time and rows returned per
+    statement, and logs statements slower than SLOW_QUERY_MS
+    """
+
+    async def _observe(self, method, query: str, args: tuple, kwargs: dict, count_rows):
+        name = statement_name(query)
+        start = time.perf_counter()
+        try:
+            result = await method(query, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            STATEMENT_DURATION.labels(name).observe(elapsed)
+            if SLOW_QUERY_MS is not None and elapsed * 1000 >= SLOW_QUERY_MS:
+                logger.warning(
+                    f"Slow query [{name}] took {elapsed * 1000:.0f}ms: "
+                    f"{normalize_sql(query)} args={args!r}"
+                )
+        if count_rows:
+            ROWS_RETURNED.labels(name).observe(count_rows(result))
+        return result
+
+    async def fetch(self, query: str, *args: Any, **kwargs: Any):
+        return await self._observe(super().fetch, query, args, kwargs, len)
+
+    async def fetchrow(self, query: str, *args: Any, **kwargs: Any):
+        return await self._observe(
+            super().fetchrow, query, args, kwargs, lambda row: int(row is not None)
+        )
+
+    async def fetchval(self, query: str, *args: Any, **kwargs: Any):
+        return await self._observe(super().fetchval, query, args, kwargs, None)
+
+    async def execute(self, query: str, *args: Any, **kwargs: Any):
+        return await self._observe(super().execute, query, args, kwargs, None)
+
+
+class InstrumentedPool:
+    """
+    Wraps an asyncpg pool to time connection acquisition and expose its size
+    as gauges. Everything else is delegated to the wrapped pool.
+    """
+
+    def __init__(self, pool: asyncpg.Pool):
+        self._pool = pool
+        POOL_MAX_SIZE.set(pool.get_max_size())
+        POOL_SIZE.set_function(pool.get_size)
+        POOL_IN_USE.set_function(lambda: pool.get_size() - pool.get_idle_size())
+
+    @asynccontextmanager
+    async def acquire(self, timeout: Optional[float] = None) -> AsyncIterator[asyncpg.Connection]:
+        start = time.perf_counter()
+        async with self._pool.acquire(timeout=timeout) as conn:
+            POOL_ACQUIRE_WAIT.observe(time.perf_counter() - start)
+            yield conn
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._pool, name)
@@ -0,0 +1,20 @@
+-- Base tables, for bootstrapping a fresh database (local development and
+-- benchmarks). A no-op on databases created before migrations existed.
+CREATE TABLE IF NOT EXISTS perspectives (
+    id UUID PRIMARY KEY,
+    title TEXT NOT NULL,
+    source TEXT NOT NULL,
+    community TEXT NOT NULL,
+    quote TEXT,
+    sentiment DOUBLE PRECISION NOT NULL DEFAULT 0,
+    url TEXT NOT NULL UNIQUE,
+    scraped_at TIMESTAMPTZ,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS comments (
+    id UUID PRIMARY KEY,
+    perspective_id UUID NOT NULL REFERENCES perspectives (id) ON DELETE CASCADE,
+    content TEXT NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
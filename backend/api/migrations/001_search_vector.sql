@@ -0,0 +1,12 @@
+-- Persist the full-text search document so searches can use a GIN index
+-- instead of computing to_tsvector() for every row on every request.
+-- Titles are weighted above the summarized quote when ranking.
+ALTER TABLE perspectives
+    ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(quote, '')), 'B')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS perspectives_search_vector_idx
+    ON perspectives USING GIN (search_vector);
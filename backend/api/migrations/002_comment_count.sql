@@ -0,0 +1,13 @@
+-- Denormalized comment counter, maintained by the API when comments are
+-- created so read endpoints don't need to join and aggregate comments.
+ALTER TABLE perspectives
+    ADD COLUMN IF NOT EXISTS comment_count INTEGER NOT NULL DEFAULT 0;
+
+UPDATE perspectives p
+SET comment_count = c.total
+FROM (
+    SELECT perspective_id, COUNT(*) AS total
+    FROM comments
+    GROUP BY perspective_id
+) c
+WHERE c.perspective_id = p.id;
@@ -0,0 +1,11 @@
+-- Monotonic version per kind of cached data. Writers bump the version in the
+-- same transaction as their change and NOTIFY cache_invalidation, so API
+-- workers switch to a fresh cache namespace as soon as the change commits.
+CREATE TABLE IF NOT EXISTS cache_versions (
+    namespace TEXT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO cache_versions (namespace)
+VALUES ('perspectives'), ('comments')
+ON CONFLICT (namespace) DO NOTHING;
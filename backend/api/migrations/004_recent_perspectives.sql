@@ -0,0 +1,23 @@
+-- Summary of the newest perspectives per community, refreshed concurrently by
+-- the scraper after each run. It only holds ids and ordering; /api/recent joins
+-- back to perspectives for the row data so comment counts stay live.
+CREATE INDEX IF NOT EXISTS perspectives_community_created_at_idx
+    ON perspectives (community, created_at DESC);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS recent_perspectives AS
+SELECT id, community, created_at
+FROM (
+    SELECT
+        p.id, p.community, p.created_at,
+        ROW_NUMBER() OVER (PARTITION BY p.community ORDER BY p.created_at DESC) AS rn
+    FROM perspectives p
+    WHERE p.community IN ('right', 'center', 'left')
+) ranked
+WHERE rn <= 20;
+
+-- Required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS recent_perspectives_id_idx
+    ON recent_perspectives (id);
+
+CREATE INDEX IF NOT EXISTS recent_perspectives_community_created_at_idx
+    ON recent_perspectives (community, created_at DESC);
@@ -0,0 +1,27 @@
+-- When a perspective's searchable content last changed. The in-process search
+-- engine polls it to pick up new and re-scraped articles. Comment count
+-- updates don't touch it, and scraped_at is not reliable for this because it
+-- moves on every re-scrape whether or not the content changed.
+ALTER TABLE perspectives
+    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW();
+
+CREATE INDEX IF NOT EXISTS perspectives_updated_at_idx ON perspectives (updated_at);
+
+CREATE OR REPLACE FUNCTION perspectives_touch_updated_at() RETURNS trigger AS $$
+BEGIN
+    IF NEW.title IS DISTINCT FROM OLD.title
+        OR NEW.quote IS DISTINCT FROM OLD.quote
+        OR NEW.source IS DISTINCT FROM OLD.source
+        OR NEW.community IS DISTINCT FROM OLD.community
+        OR NEW.sentiment IS DISTINCT FROM OLD.sentiment
+        OR NEW.url IS DISTINCT FROM OLD.url THEN
+        NEW.updated_at := NOW();
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS perspectives_touch_updated_at ON perspectives;
+CREATE TRIGGER perspectives_touch_updated_at
+    BEFORE UPDATE ON perspectives
+    FOR EACH ROW EXECUTE FUNCTION perspectives_touch_updated_at();
@@ -0,0 +1,5 @@
+-- Serves comment threads newest first, one page at a time, for both
+-- /api/perspectives/{id}/comments (keyset on (created_at, id)) and the
+-- per-perspective window in /api/comments/batch.
+CREATE INDEX IF NOT EXISTS comments_perspective_created_at_idx
+    ON comments (perspective_id, created_at DESC, id DESC);
@@ -0,0 +1,138 @@
+import os
+import asyncio
+import logging
+from pathlib import Path
+from typing import List
+
+import asyncpg
+from dotenv import load_dotenv
+
+from invalidation import BUMP_VERSION_SQL
+
+
+logger = logging.getLogger("api.schema")
+
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+
+# Arbitrary constant used to serialize migrations across API workers
+MIGRATION_LOCK_ID = 727_001
+
+# Columns the API queries depend on, checked on startup
+REQUIRED_COLUMNS = [
+    ("perspectives", "search_vector"),
+    ("perspectives", "comment_count"),
+    ("perspectives", "updated_at"),
+    ("cache_versions", "version"),
+]
+
+
+async def apply_migrations(conn: asyncpg.Connection) -> List[str]:
+    """
+    Apply any migrations in MIGRATIONS_DIR that have not been recorded in
+    schema_migrations yet. Returns the names of the migrations applied.
+    """
+    await conn.execute("SELECT pg_advisory_lock($1)", MIGRATION_LOCK_ID)
+    try:
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version TEXT PRIMARY KEY,
+                applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            )
+        """)
+        applied = {
+            record["version"]
+            for record in await conn.fetch("SELECT version FROM schema_migrations")
+        }
+
+        newly_applied = []
+        for path in sorted(MIGRATIONS_DIR.glob("*.sql")):
+            if path.stem in applied:
+                continue
+            logger.info(f"Applying migration {path.name}")
+            async with conn.transaction():
+                await conn.execute(path.read_text())
+                await conn.execute(
+                    "INSERT INTO schema_migrations (version) VALUES ($1)", path.stem
+                )
+            newly_applied.append(path.stem)
+        return newly_applied
+    finally:
+        await conn.execute("SELECT pg_advisory_unlock($1)", MIGRATION_LOCK_ID)
+
+
+async def check_schema(conn: asyncpg.Connection) -> None:
+    """Raise RuntimeError if a column the API relies on is missing"""
+    for table, column in REQUIRED_COLUMNS:
+        exists = await conn.fetchval(
+            """
+            SELECT EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = $1 AND column_name = $2
+            )
+            """,
+            table, column
+        )
+        if not exists:
+            raise RuntimeError(
+                f"Database schema is out of date: {table}.{column} is missing. "
+                "Run `python api/schema.py` to apply migrations."
+            )
+
+
+async def reconcile_comment_counts(conn: asyncpg.Connection) -> int:
+    """
+    Recompute perspectives.comment_count from the comments table and fix any
+    rows that have drifted. Returns the number of rows corrected.
+    """
+    async with conn.transaction():
+        status = await conn.execute("""
+            WITH actual AS (
+                SELECT p.id, COUNT(c.id) AS total
+                FROM perspectives p
+                LEFT JOIN comments c ON c.perspective_id = p.id
+                GROUP BY p.id
+            )
+            UPDATE perspectives p
+            SET comment_count = actual.total
+            FROM actual
+            WHERE actual.id = p.id AND p.comment_count <> actual.total
+            """)
+        # asyncpg returns the command tag, e.g. "UPDATE 3"
+        fixed = int(status.split()[-1])
+        if fixed > 0:
+            # Cached responses still carry the drifted counts
+            await conn.fetchval(BUMP_VERSION_SQL, "comments")
+    return fixed
+
+
+async def main(command: str):
+    load_dotenv()
+    conn = await asyncpg.connect(os.environ["NEON_DB_URL"])
+    try:
+        if command == "migrate":
+            applied = await apply_migrations(conn)
+            logger.info(f"Applied {len(applied)} migration(s): {', '.join(applied) or 'none'}")
+            await check_schema(conn)
+        elif command == "reconcile-comment-counts":
+            fixed = await reconcile_comment_counts(conn)
+            logger.info(f"Corrected comment_count on {fixed} perspective(s)")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Full Picture database maintenance")
+    parser.add_argument(
+        "command",
+        nargs="?",
+        default="migrate",
+        choices=["migrate", "reconcile-comment-counts"],
+        help="migrate (default) applies pending migrations; "
+             "reconcile-comment-counts repairs drifted comment counters",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(args.command))
@@ -0,0 +1,164 @@
+import re
+import time
+import heapq
+import asyncio
+import logging
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence
+
+import asyncpg
+
+from metrics import statement
+
+
+logger = logging.getLogger("api.suggest")
+
+# Newest titles loaded into the index
+SUGGEST_TITLES_SQL = statement("suggest_titles", """
+    SELECT title
+    FROM perspectives
+    ORDER BY created_at DESC
+    LIMIT $1
+""")
+
+WORD_RE = re.compile(r"[a-z0-9][a-z0-9'-]*[a-z0-9]|[a-z0-9]")
+
+# Words too common to be useful suggestions
+STOP_WORDS = frozenset("""
+    a an and are as at be but by for from has have he her his in is it its
+    of on or she that the their they this to was were will with after over
+    new says said amid into about more than out up who what how why not
+""".split())
+
+
+class PrefixIndex:
+    """
+    In-process typeahead index over recent perspective titles.
+
+    Terms are kept in a sorted array, so the terms for a prefix form one
+    contiguous slice found with two binary searches. A parallel sorted array
+    of (word, title index) pairs does the same for titles; titles are stored
+    newest first, so the lowest indexes in a slice are the newest matches.
+    """
+
+    def __init__(self, max_titles: int = 50000):
+        self.max_titles = max_titles
+        self.terms: List[str] = []
+        self.term_counts: List[int] = []
+        self.titles: List[str] = []
+        self.title_word_sets: List[FrozenSet[str]] = []
+        self.title_words: List[str] = []
+        self.title_ids: List[int] = []
+        self.built_version: Optional[int] = None
+        self.built_at = 0.0
+
+    @staticmethod
+    def words(text: str) -> List[str]:
+        return [
+            word for word in WORD_RE.findall(text.lower())
+            if len(word) > 1 and word not in STOP_WORDS
+        ]
+
+    def build(self, titles: Sequence[str]) -> None:
+        """Rebuild the index from titles ordered newest first"""
+        self._install(self._index(titles))
+
+    @classmethod
+    def _index(cls, titles: Sequence[str]) -> Dict[str, Any]:
+        """The index structures for titles; CPU-bound, so refresh runs it in a thread"""
+        counts: Counter = Counter()
+        pairs = []
+        word_sets = []
+        for title_id, title in enumerate(titles):
+            words = frozenset(cls.words(title))
+            word_sets.append(words)
+            counts.update(words)
+            pairs.extend((word, title_id) for word in words)
+        pairs.sort()
+
+        terms = sorted(counts)
+        return {
+            "terms": terms,
+            "term_counts": [counts[term] for term in terms],
+            "titles": list(titles),
+            "title_word_sets": word_sets,
+            "title_words": [word for word, _ in pairs],
+            "title_ids": [title_id for _, title_id in pairs],
+        }
+
+    def _install(self, index: Dict[str, Any]) -> None:
+        # Runs on the event loop with no await, so readers never see a mix
+        for name, value in index.items():
+            setattr(self, name, value)
+        self.built_at = time.monotonic()
+
+    async def refresh(self, pool: asyncpg.Pool, version: Optional[int] = None) -> None:
+        async with pool.acquire() as conn:
+            records = await conn.fetch(SUGGEST_TITLES_SQL, self.max_titles)
+        titles = [record["title"] for record in records if record["title"]]
+        self._install(await asyncio.to_thread(self._index, titles))
+        self.built_version = version
+        logger.info(f"Built suggestion index: {len(self.terms)} terms from {len(self.titles)} titles")
+
+    async def keep_fresh(
+        self,
+        pool: asyncpg.Pool,
+        current_version: Callable[[], Optional[int]],
+        min_interval: float = 300,
+        poll_interval: float = 5
+    ) -> None:
+        """
+        Rebuild when the perspectives data version moves on, at most once
+        every min_interval seconds so a scraper run costs one or two rebuilds
+        """
+        while True:
+            await asyncio.sleep(poll_interval)
+            version = current_version()
+            if version == self.built_version:
+                continue
+            if time.monotonic() - self.built_at < min_interval:
+                continue
+            try:
+                await self.refresh(pool, version)
+            except Exception as e:
+                # Keep serving the previous index
+                logger.error(f"Failed to rebuild suggestion index: {str(e)}")
+                self.built_at = time.monotonic()
+
+    @staticmethod
+    def _prefix_range(values: List[str], prefix: str):
+        start = bisect_left(values, prefix)
+        # Every string starting with prefix sorts below prefix + U+FFFF
+        end = bisect_left(values, prefix + "\uffff", lo=start)
+        return start, end
+
+    def suggest(self, prefix: str, limit: int = 8) -> Dict[str, List[str]]:
+        """Most frequent terms and newest titles containing a word starting with prefix"""
+        typed = WORD_RE.findall(prefix.lower())
+        if not typed:
+            return {"terms": [], "titles": []}
+        # Complete the word being typed, even if it is so far a stop word or a
+        # single letter ("new" on the way to "newsom"); earlier words must
+        # appear in the title unless they are too common to be indexed
+        last = typed[-1]
+        required = frozenset(self.words(" ".join(typed[:-1])))
+
+        start, end = self._prefix_range(self.terms, last)
+        best = heapq.nlargest(limit, range(start, end), key=self.term_counts.__getitem__)
+        terms = [self.terms[i] for i in best]
+
+        start, end = self._prefix_range(self.title_words, last)
+        titles = []
+        seen = set()
+        for title_id in sorted(self.title_ids[start:end]):
+            if title_id in seen:
+                continue
+            seen.add(title_id)
+            if not required <= self.title_word_sets[title_id]:
+                continue
+            titles.append(self.titles[title_id])
+            if len(titles) == limit:
+                break
+
+        return {"terms": terms, "titles": titles}
@@ -0,0 +1,165 @@
+import time
+import asyncio
+import logging
+from collections import Counter
+from typing import Awaitable, Callable, List, Optional
+
+from metrics import CACHE_WARM_DURATION
+
+
+logger = logging.getLogger("api.warming")
+
+# Postgres channel the scraper NOTIFYs when a run has finished
+WARM_CHANNEL = "cache_warm"
+
+
+class QueryStats:
+    """
+    Counts how often each normalized search query is asked for. Counts are
+    buffered in process and flushed to a Redis sorted set shared by every
+    worker; without Redis each worker ranks its own queries. decay() halves
+    all counts and drops those below 1, so the ranking follows what is
+    trending rather than what was popular last month.
+    """
+
+    def __init__(self, key: str = "fastapi-cache:query-stats", max_queries: int = 10000):
+        self.key = key
+        self.max_queries = max_queries
+        self.redis = None
+        self._pending: Counter = Counter()
+        self._local: Counter = Counter()
+
+    def record(self, tsquery: str) -> None:
+        if tsquery:
+            self._pending[tsquery] += 1
+
+    async def flush(self) -> None:
+        pending, self._pending = self._pending, Counter()
+        if not pending:
+            return
+        if self.redis is None:
+            self._local.update(pending)
+            if len(self._local) > 2 * self.max_queries:
+                self._local = Counter(dict(self._local.most_common(self.max_queries)))
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for tsquery, count in pending.items():
+                pipe.zincrby(self.key, count, tsquery)
+            # Keep only the most frequent queries
+            pipe.zremrangebyrank(self.key, 0, -self.max_queries - 1)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to record query stats in Redis: {str(e)}")
+
+    async def flush_periodically(self, interval: float = 10) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self.flush()
+
+    async def top(self, k: int) -> List[str]:
+        """The k most frequent queries, most frequent first"""
+        await self.flush()
+        if self.redis is None:
+            return [tsquery for tsquery, _ in self._local.most_common(k)]
+        try:
+            members = await self.redis.zrevrange(self.key, 0, k - 1)
+        except Exception as e:
+            logger.warning(f"Failed to read query stats from Redis: {str(e)}")
+            return []
+        return [m.decode() if isinstance(m, bytes) else m for m in members]
+
+    async def decay(self) -> None:
+        if self.redis is None:
+            self._local = Counter({
+                tsquery: count / 2 for tsquery, count in self._local.items() if count >= 2
+            })
+            return
+        try:
+            # Every worker warms after a scrape, but the counts decay once
+            if not await self.redis.set(f"{self.key}:decayed", 1, nx=True, ex=60):
+                return
+            await self.redis.zunionstore(self.key, {self.key: 0.5})
+            await self.redis.zremrangebyscore(self.key, "-inf", "(1")
+        except Exception as e:
+            logger.warning(f"Failed to decay query stats in Redis: {str(e)}")
+
+
+class CacheWarmer:
+    """
+    Refills the cache after a scrape: re-runs the top_k most frequent
+    searches and the fixed endpoints in warm_fixed, at most concurrency at
+    a time so warming never takes the whole connection pool. A warm
+    requested while one is running is skipped. With Redis, the first worker
+    to claim lock_key warms the shared cache and the others skip, filling
+    their own L1 from Redis as requests arrive.
+    """
+
+    def __init__(
+        self,
+        stats: QueryStats,
+        warm_query: Callable[[str], Awaitable[None]],
+        warm_fixed: List[Callable[[], Awaitable[None]]],
+        top_k: int = 50,
+        concurrency: int = 4,
+        lock_key: str = "fastapi-cache:warming",
+        lock_seconds: int = 60
+    ):
+        self.stats = stats
+        self.warm_query = warm_query
+        self.warm_fixed = warm_fixed
+        self.top_k = top_k
+        self.concurrency = concurrency
+        self.lock_key = lock_key
+        self.lock_seconds = lock_seconds
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    def trigger(self) -> None:
+        if self._task is not None and not self._task.done():
+            logger.info("Cache warm already running, skipping")
+            return
+        self._task = asyncio.ensure_future(self.warm())
+
+    def on_notification(self, conn, pid, channel, payload: str) -> None:
+        logger.info(f"Cache warm requested ({payload})")
+        self.trigger()
+
+    async def claim(self) -> bool:
+        """Whether this worker should warm; every worker is notified of a scrape"""
+        if self.stats.redis is None:
+            return True
+        try:
+            return bool(await self.stats.redis.set(self.lock_key, 1, nx=True, ex=self.lock_seconds))
+        except Exception as e:
+            # Warming twice beats not warming at all
+            logger.warning(f"Failed to claim cache warm lock in Redis: {str(e)}")
+            return True
+
+    async def warm(self) -> None:
+        if not await self.claim():
+            logger.info("Cache warm claimed by another worker, skipping")
+            return
+        start = time.perf_counter()
+        queries = await self.stats.top(self.top_k)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(label: str, fn: Callable[[], Awaitable[None]]) -> bool:
+            async with semaphore:
+                try:
+                    await fn()
+                    return True
+                except Exception as e:
+                    logger.warning(f"Failed to warm {label}: {str(e)}")
+                    return False
+
+        jobs = [run("fixed endpoint", fn) for fn in self.warm_fixed]
+        jobs += [run(f"query '{q}'", lambda q=q: self.warm_query(q)) for q in queries]
+        results = await asyncio.gather(*jobs)
+        await self.stats.decay()
+
+        elapsed = time.perf_counter() - start
+        CACHE_WARM_DURATION.observe(elapsed)
+        logger.info(
+            f"Warmed {sum(results)}/{len(results)} cache entries "
+            f"({len(queries)} queries) in {elapsed:.1f}s"
+        )
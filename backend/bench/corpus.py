@@ -0,0 +1,106 @@
+import random
+from typing import List, Sequence, Tuple
+
+# Sources and their communities, mirroring scraping/main.py
+SOURCES: List[Tuple[str, str, str]] = [
+    ("Fox News", "right", "https://www.foxnews.com"),
+    ("New York Post", "right", "https://nypost.com"),
+    ("Wall Street Journal", "right", "https://www.wsj.com"),
+    ("CNBC", "center", "https://www.cnbc.com"),
+    ("New York Times", "left", "https://www.nytimes.com"),
+    ("Newsweek", "left", "https://www.newsweek.com"),
+    ("The Guardian", "left", "https://www.theguardian.com"),
+]
+
+# Topics ordered from most to least newsworthy; both article topics and
+# search queries are drawn from this list with a Zipf distribution
+TOPICS: List[str] = [
+    "trump", "economy", "biden", "tariffs", "ukraine", "gaza", "inflation",
+    "immigration", "ai", "election", "supreme court", "china", "israel",
+    "climate", "stock market", "federal reserve", "border", "congress",
+    "russia", "taxes", "healthcare", "abortion", "iran", "interest rates",
+    "housing", "tesla", "elon musk", "tiktok", "education", "crime",
+    "energy", "oil prices", "nato", "jobs report", "student loans",
+    "social security", "medicare", "gun control", "wildfires", "hurricane",
+    "vaccines", "covid", "mexico", "canada", "north korea", "taiwan",
+    "apple", "google", "microsoft", "nvidia", "crypto", "bitcoin",
+    "labor unions", "minimum wage", "police", "protests", "free speech",
+    "pentagon", "cybersecurity", "space", "nasa", "olympics", "super bowl",
+]
+
+SUBJECTS = [
+    "Officials", "Lawmakers", "The White House", "Analysts", "Critics",
+    "Supporters", "Investors", "Voters", "Experts", "Republicans",
+    "Democrats", "Economists", "Advocates", "Governors",
+]
+
+VERBS = [
+    "warn about", "push back on", "weigh in on", "sound the alarm over",
+    "celebrate", "question", "rally behind", "clash over", "brace for",
+    "demand answers on", "split over", "double down on",
+]
+
+FRAMES = [
+    "new report on {topic}",
+    "{topic} showdown",
+    "latest twist in {topic} fight",
+    "{topic} policy shift",
+    "fallout from {topic} decision",
+    "{topic} deal",
+    "surprise {topic} numbers",
+    "growing {topic} crisis",
+]
+
+DETAILS = [
+    "The move comes amid heightened scrutiny from both parties.",
+    "Markets reacted sharply to the news on Monday.",
+    "Polls suggest the public remains deeply divided on the issue.",
+    "The administration defended the decision in a statement.",
+    "Opponents vowed to challenge the measure in court.",
+    "Industry groups said the change could cost billions.",
+    "Local officials described the situation as unprecedented.",
+    "Several key questions remain unanswered, according to sources.",
+    "The debate is expected to dominate the coming weeks.",
+    "Independent analysts cautioned against drawing early conclusions.",
+]
+
+COMMENTS = [
+    "This is the full picture I was looking for.",
+    "Interesting how differently each side covers this.",
+    "Not sure I agree with this framing.",
+    "Great summary, thanks.",
+    "The headline doesn't match the article at all.",
+    "Would love to see more sources on this.",
+    "This aged quickly.",
+    "Finally some balanced coverage.",
+]
+
+
+def zipf_weights(n: int, s: float = 1.1) -> List[float]:
+    """Weights for ranks 1..n under a Zipf distribution with exponent s"""
+    return [1.0 / (rank ** s) for rank in range(1, n + 1)]
+
+
+class ZipfSampler:
+    """Draws items so the k-th item is picked with probability ~ 1/k^s"""
+
+    def __init__(self, items: Sequence, s: float = 1.1, rng: random.Random = random):
+        self.items = list(items)
+        self.weights = zipf_weights(len(self.items), s)
+        self.rng = rng
+
+    def sample(self):
+        return self.rng.choices(self.items, weights=self.weights, k=1)[0]
+
+
+def make_title(rng: random.Random, topic: str) -> str:
+    frame = rng.choice(FRAMES).format(topic=topic)
+    return f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {frame}"
+
+
+def make_quote(rng: random.Random, topic: str, secondary: str) -> str:
+    lead = (
+        f"Coverage of {topic} intensified as {rng.choice(SUBJECTS).lower()} "
+        f"{rng.choice(VERBS)} {secondary}."
+    )
+    return " ".join([lead] + rng.sample(DETAILS, 2))
@@ -0,0 +1,150 @@
+import json
+import time
+import random
+import asyncio
+import argparse
+import statistics
+from collections import defaultdict
+from typing import Dict, List
+
+import httpx
+
+from corpus import COMMENTS, TOPICS, ZipfSampler
+
+
+class LoadDriver:
+    """
+    Replays a weighted mix of searches (Zipf-distributed over TOPICS),
+    /api/recent hits and comment posts against a running API, recording
+    latency per endpoint.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, mix: Dict[str, float], rng: random.Random):
+        self.client = client
+        self.mix = mix
+        self.rng = rng
+        self.queries = ZipfSampler(TOPICS, rng=rng)
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        # Perspective ids seen in responses, used as comment targets
+        self.perspective_ids: List[str] = []
+
+    async def search(self):
+        response = await self.client.get("/api/perspectives", params={"query": self.queries.sample()})
+        if response.status_code == 200:
+            for perspective in response.json()["results"][:5]:
+                self.remember(perspective["id"])
+        return response
+
+    async def recent(self):
+        response = await self.client.get("/api/recent")
+        if response.status_code == 200:
+            for perspective in response.json():
+                self.remember(perspective["id"])
+        return response
+
+    async def comment(self):
+        perspective_id = self.rng.choice(self.perspective_ids)
+        return await self.client.post(
+            f"/api/perspectives/{perspective_id}/comments",
+            json={"content": self.rng.choice(COMMENTS)},
+        )
+
+    def remember(self, perspective_id: str):
+        if len(self.perspective_ids) < 1000:
+            self.perspective_ids.append(perspective_id)
+
+    async def worker(self, deadline: float):
+        kinds = list(self.mix)
+        weights = [self.mix[kind] for kind in kinds]
+        while time.perf_counter() < deadline:
+            kind = self.rng.choices(kinds, weights=weights, k=1)[0]
+            if kind == "comment" and not self.perspective_ids:
+                # Nothing to comment on yet; fetch targets, and time it as what it is
+                kind = "recent"
+            start = time.perf_counter()
+            try:
+                response = await getattr(self, kind)()
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            elapsed = time.perf_counter() - start
+            if ok:
+                self.latencies[kind].append(elapsed)
+            else:
+                self.errors[kind] += 1
+
+    async def run(self, concurrency: int, duration: float):
+        if "comment" in self.mix and not self.perspective_ids:
+            # Unmeasured, so comment posts have targets from the start
+            try:
+                await self.recent()
+            except httpx.HTTPError:
+                pass
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(self.worker(deadline) for _ in range(concurrency)))
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(driver: LoadDriver, duration: float) -> Dict[str, Dict[str, float]]:
+    report = {}
+    for kind in sorted(set(driver.latencies) | set(driver.errors)):
+        values = sorted(driver.latencies.get(kind, []))
+        report[kind] = {
+            "requests": len(values),
+            "errors": driver.errors.get(kind, 0),
+            "throughput_rps": len(values) / duration,
+            "mean_ms": statistics.fmean(values) * 1000 if values else 0.0,
+            "p50_ms": percentile(values, 50) * 1000,
+            "p95_ms": percentile(values, 95) * 1000,
+            "p99_ms": percentile(values, 99) * 1000,
+        }
+    return report
+
+
+def print_report(report: Dict[str, Dict[str, float]]):
+    header = f"{'endpoint':<10} {'requests':>9} {'errors':>7} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    print(header)
+    print("-" * len(header))
+    for kind, stats in report.items():
+        print(
+            f"{kind:<10} {stats['requests']:>9} {stats['errors']:>7} {stats['throughput_rps']:>8.1f} "
+            f"{stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f}"
+        )
+
+
+async def main(args):
+    mix = {"search": args.search_weight, "recent": args.recent_weight, "comment": args.comment_weight}
+    mix = {kind: weight for kind, weight in mix.items() if weight > 0}
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30) as client:
+        if args.warmup:
+            await LoadDriver(client, mix, random.Random(args.seed + 1)).run(args.concurrency, args.warmup)
+        driver = LoadDriver(client, mix, random.Random(args.seed))
+        await driver.run(args.concurrency, args.duration)
+
+    report = summarize(driver, args.duration)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a search/recent/comment mix against the API")
+    parser.add_argument("--base-url", default="http://localhost:8000", help="API base URL")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="Measured run length in seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="Unmeasured warmup in seconds (0 to skip)")
+    parser.add_argument("--search-weight", type=float, default=0.80, help="Share of search requests")
+    parser.add_argument("--recent-weight", type=float, default=0.15, help="Share of /api/recent requests")
+    parser.add_argument("--comment-weight", type=float, default=0.05, help="Share of comment posts")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed, for a reproducible request mix")
+    parser.add_argument("--json", help="Also write the report to this JSON file")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,119 @@
+import os
+import uuid
+import random
+import asyncio
+import logging
+import argparse
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+import asyncpg
+from dotenv import load_dotenv
+
+from corpus import COMMENTS, SOURCES, TOPICS, ZipfSampler, make_quote, make_title
+
+
+logger = logging.getLogger("bench.seed")
+
+# Share of articles per community, roughly matching what the scraper collects
+COMMUNITY_MIX = {"left": 0.45, "right": 0.40, "center": 0.15}
+
+
+def generate_perspectives(rng: random.Random, count: int, days: int):
+    topics = ZipfSampler(TOPICS, rng=rng)
+    communities = list(COMMUNITY_MIX)
+    weights = [COMMUNITY_MIX[c] for c in communities]
+    sources_by_community = {
+        community: [source for source in SOURCES if source[1] == community]
+        for community in communities
+    }
+    now = datetime.now(timezone.utc)
+
+    for i in range(count):
+        community = rng.choices(communities, weights=weights, k=1)[0]
+        source, _, base_url = rng.choice(sources_by_community[community])
+        topic = topics.sample()
+        title = make_title(rng, topic)
+        created_at = now - timedelta(seconds=rng.uniform(0, days * 86400))
+        yield (
+            uuid.UUID(int=rng.getrandbits(128), version=4),
+            title,
+            source,
+            community,
+            make_quote(rng, topic, topics.sample()),
+            round(rng.uniform(-1, 1), 3),
+            f"{base_url}/bench/{i}-{topic.replace(' ', '-')}",
+            created_at,
+            created_at,
+        )
+
+
+def generate_comments(rng: random.Random, perspective_ids, count: int):
+    # A few articles attract most of the discussion
+    popular = ZipfSampler(perspective_ids, s=1.2, rng=rng)
+    now = datetime.now(timezone.utc)
+    for _ in range(count):
+        yield (
+            uuid.UUID(int=rng.getrandbits(128), version=4),
+            popular.sample(),
+            rng.choice(COMMENTS),
+            now - timedelta(seconds=rng.uniform(0, 7 * 86400)),
+        )
+
+
+async def seed(dsn: str, perspectives: int, comments: int, days: int, seed_value: int, reset: bool):
+    rng = random.Random(seed_value)
+    conn = await asyncpg.connect(dsn)
+    try:
+        if reset:
+            await conn.execute("TRUNCATE comments, perspectives")
+
+        perspective_rows = list(generate_perspectives(rng, perspectives, days))
+        await conn.copy_records_to_table(
+            "perspectives",
+            records=perspective_rows,
+            columns=[
+                "id", "title", "source", "community", "quote",
+                "sentiment", "url", "scraped_at", "created_at",
+            ],
+        )
+        logger.info(f"Inserted {len(perspective_rows)} perspectives")
+
+        ids = [row[0] for row in perspective_rows]
+        comment_rows = list(generate_comments(rng, ids, comments)) if ids else []
+        await conn.copy_records_to_table(
+            "comments",
+            records=comment_rows,
+            columns=["id", "perspective_id", "content", "created_at"],
+        )
+        logger.info(f"Inserted {len(comment_rows)} comments")
+
+        # Keep the denormalized counters in line with the generated comments
+        counts = Counter(row[1] for row in comment_rows)
+        await conn.executemany(
+            "UPDATE perspectives SET comment_count = comment_count + $2 WHERE id = $1",
+            list(counts.items()),
+        )
+        await conn.execute("ANALYZE perspectives; ANALYZE comments")
+        await conn.execute("REFRESH MATERIALIZED VIEW recent_perspectives")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Seed a benchmark database with synthetic perspectives")
+    parser.add_argument("--dsn", default=os.environ.get("BENCH_DB_URL"), help="Postgres DSN (default: $BENCH_DB_URL)")
+    parser.add_argument("--perspectives", type=int, default=50000, help="Number of perspectives to insert")
+    parser.add_argument("--comments", type=int, default=20000, help="Number of comments to insert")
+    parser.add_argument("--days", type=int, default=180, help="Spread created_at over this many days")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed, for reproducible data")
+    parser.add_argument("--reset", action="store_true", help="Truncate perspectives and comments first")
+    args = parser.parse_args()
+
+    if not args.dsn:
+        parser.error("--dsn or BENCH_DB_URL is required")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    asyncio.run(seed(args.dsn, args.perspectives, args.comments, args.days, args.seed, args.reset))
@@ -14,7 +14,7 @@ import { useMediaQuery } from "@/hooks/useMediaQuery";
 export default function SearchPage() {
   const searchParams = useSearchParams();
   const initialQuery = searchParams.get("q") || "";
-  const { articles, error, isLoading, setQuery } = useSearch(initialQuery);
+  const { articles, error, isLoading, isLoadingMore, hasMore, loadMore, setQuery } = useSearch(initialQuery);
   const [layoutMode, setLayoutMode] = useState<'balanced' | 'grouped'>('grouped');
   const [isAboutVisible, setIsAboutVisible] = useState(true);
   const isDesktop = useMediaQuery('(min-width: 1024px)');
@@ -29,6 +29,21 @@ export default function SearchPage() {
     return () => window.removeEventListener('scroll', handleScroll);
   }, []);
 
+  // Fetch the next page of results when the user nears the bottom
+  useEffect(() => {
+    if (!hasMore) return;
+
+    const handleInfiniteScroll = () => {
+      const distanceFromBottom = document.documentElement.scrollHeight - (window.innerHeight + window.scrollY);
+      if (distanceFromBottom < 800) {
+        loadMore();
+      }
+    };
+
+    window.addEventListener('scroll', handleInfiniteScroll);
+    return () => window.removeEventListener('scroll', handleInfiniteScroll);
+  }, [hasMore, loadMore]);
+
   const groupedArticles = groupArticlesByLeaning(articles);
 
   const renderArticles = () => {
@@ -99,7 +114,7 @@ export default function SearchPage() {
               />
             ))}
 
-            {articles.length < globalMaxArticles && isDesktop && layoutMode === 'grouped' && articles.length > 0 && (
+            {!hasMore && articles.length < globalMaxArticles && isDesktop && layoutMode === 'grouped' && articles.length > 0 && (
               <div className={styles.emptyState}>
                 <div className={styles.asterisk} style={{ color: perspectiveColor, fontSize: '3.5rem' }}>*</div>
                 <h3 className={styles.emptyStateTitle}>No more {perspective.toLowerCase()} perspectives on &apos;{initialQuery}&apos; yet</h3>
@@ -203,6 +218,12 @@ export default function SearchPage() {
           <div className={styles.layoutWrapper}>
             {renderArticles()}
           </div>
+
+          {isLoadingMore && (
+            <div className={styles.loading}>
+              Loading more...
+            </div>
+          )}
         </>
       )}
     </div>
@@ -2,13 +2,7 @@
 
 import { useState, useEffect } from 'react';
 import styles from './CommentSection.module.css';
-
-interface Comment {
-  id: string;
-  perspective_id: string;
-  content: string;
-  created_at?: string;
-}
+import { Comment, COMMENTS_PAGE_SIZE, loadComments, loadOlderComments } from '@/utils/commentLoader';
 
 interface CommentSectionProps {
   perspectiveId: string;
@@ -28,6 +22,9 @@ export default function CommentSection({
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [hasFetched, setHasFetched] = useState(false);
+  // Older comments are only fetched when asked for
+  const [hasOlder, setHasOlder] = useState(false);
+  const [loadingOlder, setLoadingOlder] = useState(false);
 
   // Fetch comments only when isOpen becomes true for the first time, or if perspectiveId changes while open
   useEffect(() => {
@@ -39,6 +36,7 @@ export default function CommentSection({
     if (!isOpen) {
       setHasFetched(false);
       setComments([]); // Clear old comments when closing
+      setHasOlder(false);
       setError(null);
     }
   }, [isOpen, perspectiveId, hasFetched]);
@@ -49,12 +47,9 @@ export default function CommentSection({
     setError(null);
     setHasFetched(true);
     try {
-      const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/api/perspectives/${perspectiveId}/comments`);
-      if (!response.ok) {
-        throw new Error('Failed to fetch comments');
-      }
-      const data = await response.json();
+      const data = await loadComments(perspectiveId);
       setComments(data);
+      setHasOlder(data.length === COMMENTS_PAGE_SIZE);
       onCommentsLoaded?.(data.length);
     } catch (err) {
       setError('Error loading comments. Please try again later.');
@@ -65,6 +60,23 @@ export default function CommentSection({
     }
   };
 
+  const fetchOlderComments = async () => {
+    const oldest = comments[comments.length - 1];
+    if (!oldest) return;
+    setLoadingOlder(true);
+    setError(null);
+    try {
+      const data = await loadOlderComments(perspectiveId, oldest.id);
+      setComments((current) => [...current, ...data]);
+      setHasOlder(data.length === COMMENTS_PAGE_SIZE);
+    } catch (err) {
+      setError('Error loading comments. Please try again later.');
+      console.error('Error fetching older comments:', err);
+    } finally {
+      setLoadingOlder(false);
+    }
+  };
+
   const handleSubmitComment = async (e: React.FormEvent) => {
     e.preventDefault();
     if (!newComment.trim() || !perspectiveId) {
@@ -154,6 +166,16 @@ export default function CommentSection({
             </div>
           ))
         )}
+        {hasOlder && (
+          <button
+            type="button"
+            className={styles.loadOlder}
+            onClick={fetchOlderComments}
+            disabled={loadingOlder}
+          >
+            {loadingOlder ? 'Loading...' : 'Show older comments'}
+          </button>
+        )}
       </div>
     </div>
   );
@@ -1,9 +1,18 @@
 "use client";
 
-import { useState, useEffect } from "react";
+import { useState, useEffect, useCallback } from "react";
 import { useRouter } from "next/navigation";
 import styles from "./SearchBar.module.css";
 
+interface Suggestions {
+  terms: string[];
+  titles: string[];
+}
+
+// Typeahead requests wait for a short pause in typing
+const SUGGEST_DEBOUNCE_MS = 150;
+const MIN_PREFIX_LENGTH = 2;
+
 interface SearchBarProps {
   onSearch?: (query: string) => void;
   initialValue?: string;
@@ -13,29 +22,73 @@ export default function SearchBar({ onSearch, initialValue = "" }: SearchBarProp
   const [inputText, setInputText] = useState(initialValue);
   const router = useRouter();
 
+  const [suggestions, setSuggestions] = useState<string[]>([]);
+  const [highlighted, setHighlighted] = useState(-1);
+  const [showSuggestions, setShowSuggestions] = useState(false);
+
   const handleInputChange = (e: React.ChangeEvent<HTMLInputElement>) => {
     setInputText(e.target.value);
+    setHighlighted(-1);
+    setShowSuggestions(true);
   };
 
+  // Only suggestions are fetched while typing; the full search runs on
+  // Enter or when a suggestion is picked
   useEffect(() => {
-    const timer = setTimeout(() => {
-      const trimmedInput = inputText.trim();
-      if (trimmedInput) {
-        router.push(`/search?q=${encodeURIComponent(trimmedInput)}`);
-        onSearch?.(trimmedInput);
+    const prefix = inputText.trim();
+    if (prefix.length < MIN_PREFIX_LENGTH) {
+      setSuggestions([]);
+      return;
+    }
+
+    const controller = new AbortController();
+    const timer = setTimeout(async () => {
+      try {
+        const response = await fetch(
+          `${process.env.NEXT_PUBLIC_API_URL}/api/suggest?prefix=${encodeURIComponent(prefix)}&limit=5`,
+          { signal: controller.signal }
+        );
+        if (!response.ok) return;
+        const data: Suggestions = await response.json();
+        // Complete the word being typed, keeping what came before it
+        const head = prefix.slice(0, prefix.lastIndexOf(" ") + 1);
+        const completions = data.terms.map((term) => head + term);
+        setSuggestions(Array.from(new Set([...completions, ...data.titles])));
+      } catch (err) {
+        if ((err as Error).name !== "AbortError") {
+          console.error("Error fetching suggestions:", err);
+        }
       }
-    }, 500);
+    }, SUGGEST_DEBOUNCE_MS);
+
+    return () => {
+      clearTimeout(timer);
+      controller.abort();
+    };
+  }, [inputText]);
 
-    return () => clearTimeout(timer);
-  }, [inputText, router, onSearch]);
+  const submit = useCallback((query: string) => {
+    const trimmedInput = query.trim();
+    if (trimmedInput) {
+      setInputText(trimmedInput);
+      setShowSuggestions(false);
+      router.push(`/search?q=${encodeURIComponent(trimmedInput)}`);
+      onSearch?.(trimmedInput);
+    }
+  }, [router, onSearch]);
 
   const handleKeyDown = (e: React.KeyboardEvent<HTMLInputElement>) => {
-    if (e.key === "Enter") {
-      const trimmedInput = inputText.trim();
-      if (trimmedInput) {
-        router.push(`/search?q=${encodeURIComponent(trimmedInput)}`);
-        onSearch?.(trimmedInput);
-      }
+    const open = showSuggestions && suggestions.length > 0;
+    if (e.key === "ArrowDown" && open) {
+      e.preventDefault();
+      setHighlighted((i) => (i + 1) % suggestions.length);
+    } else if (e.key === "ArrowUp" && open) {
+      e.preventDefault();
+      setHighlighted((i) => (i <= 0 ? suggestions.length - 1 : i - 1));
+    } else if (e.key === "Escape") {
+      setShowSuggestions(false);
+    } else if (e.key === "Enter") {
+      submit(open && highlighted >= 0 ? suggestions[highlighted] : inputText);
     }
   };
 
@@ -47,6 +100,8 @@ export default function SearchBar({ onSearch, initialValue = "" }: SearchBarProp
         value={inputText}
         onChange={handleInputChange}
         onKeyDown={handleKeyDown}
+        onFocus={() => setShowSuggestions(true)}
+        onBlur={() => setShowSuggestions(false)}
         placeholder="Search a topic (e.g, Gaza, AI, Economy...)"
       />
       <div className={styles.searchIcon}>
@@ -58,6 +113,26 @@ export default function SearchBar({ onSearch, initialValue = "" }: SearchBarProp
             strokeLinejoin="round"/>
         </svg>
       </div>
+      {showSuggestions && suggestions.length > 0 && (
+        <ul className={styles.suggestions} role="listbox">
+          {suggestions.map((suggestion, i) => (
+            <li
+              key={suggestion}
+              role="option"
+              aria-selected={i === highlighted}
+              className={`${styles.suggestion} ${i === highlighted ? styles.suggestionActive : ""}`}
+              // mousedown fires before the input's blur hides the list
+              onMouseDown={(e) => {
+                e.preventDefault();
+                submit(suggestion);
+              }}
+              onMouseEnter={() => setHighlighted(i)}
+            >
+              {suggestion}
+            </li>
+          ))}
+        </ul>
+      )}
     </div>
   );
 }
@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useCallback, useRef } from 'react';
 
 interface Article {
   id: string;
@@ -12,47 +12,86 @@ interface Article {
   comment_count: number;
 }
 
+interface PerspectivePage {
+  results: Article[];
+  next_cursor: string | null;
+}
+
 interface UseSearchResult {
   articles: Article[];
   error: string | null;
   isLoading: boolean;
+  isLoadingMore: boolean;
+  hasMore: boolean;
+  loadMore: () => void;
   setQuery: (query: string) => void;
 }
 
+const PAGE_SIZE = 50;
+
 export function useSearch(initialQuery: string = ''): UseSearchResult {
   const [articles, setArticles] = useState<Article[]>([]);
   const [error, setError] = useState<string | null>(null);
   const [query, setQuery] = useState<string>(initialQuery);
   const [isLoading, setIsLoading] = useState(false);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  // The query whose results are on screen; responses for any other query are stale
+  const currentQuery = useRef<string>(initialQuery);
   const apiUrl = process.env.NEXT_PUBLIC_API_URL;
 
+  const fetchPage = useCallback(async (searchQuery: string, cursor: string | null): Promise<PerspectivePage> => {
+    const params = new URLSearchParams({ query: searchQuery, limit: String(PAGE_SIZE) });
+    if (cursor) {
+      params.set('cursor', cursor);
+    }
+
+    const endpoint = `${apiUrl}/api/perspectives?${params.toString()}`;
+    const res = await fetch(endpoint, {
+      headers: { Accept: "application/json" },
+    });
+
+    if (!res.ok) {
+      throw new Error(`HTTP error! status: ${res.status}`);
+    }
+
+    return res.json();
+  }, [apiUrl]);
+
   useEffect(() => {
-    const fetchArticles = async () => {
-      if (!query.trim()) {
-        setArticles([]);
-        return;
-      }
+    // Drop the previous query's results and cursor right away, so loadMore
+    // can't append its next page to this query's results
+    currentQuery.current = query;
+    setArticles([]);
+    setNextCursor(null);
+    setIsLoading(false);
+    setIsLoadingMore(false);
+
+    if (!query.trim()) {
+      return;
+    }
 
+    const fetchArticles = async () => {
       setIsLoading(true);
       setError(null);
 
       try {
-        const endpoint = `${apiUrl}/api/perspectives?query=${encodeURIComponent(query)}`;
-        const res = await fetch(endpoint, {
-          headers: { Accept: "application/json" },
-        });
-
-        if (!res.ok) {
-          throw new Error(`HTTP error! status: ${res.status}`);
+        const page = await fetchPage(query, null);
+        if (currentQuery.current !== query) {
+          return;
         }
-
-        const data = await res.json();
-        setArticles(data);
+        setArticles(page.results);
+        setNextCursor(page.next_cursor);
       } catch (err) {
+        if (currentQuery.current !== query) {
+          return;
+        }
         console.error(`Error fetching articles:`, err);
         setError(err instanceof Error ? err.message : 'An error occurred while fetching articles');
       } finally {
-        setIsLoading(false);
+        if (currentQuery.current === query) {
+          setIsLoading(false);
+        }
       }
     };
 
@@ -62,7 +101,41 @@ export function useSearch(initialQuery: string = ''): UseSearchResult {
     }, 300); // 300ms debounce
 
     return () => clearTimeout(timeoutId);
-  }, [query, apiUrl]);
+  }, [query, fetchPage]);
+
+  const loadMore = useCallback(async () => {
+    if (!nextCursor || isLoading || isLoadingMore) {
+      return;
+    }
+
+    setIsLoadingMore(true);
+    try {
+      const page = await fetchPage(query, nextCursor);
+      if (currentQuery.current !== query) {
+        return;
+      }
+      setArticles(prev => [...prev, ...page.results]);
+      setNextCursor(page.next_cursor);
+    } catch (err) {
+      if (currentQuery.current !== query) {
+        return;
+      }
+      console.error(`Error fetching more articles:`, err);
+      setError(err instanceof Error ? err.message : 'An error occurred while fetching articles');
+    } finally {
+      if (currentQuery.current === query) {
+        setIsLoadingMore(false);
+      }
+    }
+  }, [query, nextCursor, isLoading, isLoadingMore, fetchPage]);
 
-  return { articles, error, isLoading, setQuery };
-} 
\ No newline at end of file
+  return {
+    articles,
+    error,
+    isLoading,
+    isLoadingMore,
+    hasMore: nextCursor !== null,
+    loadMore,
+    setQuery,
+  };
+}
@@ -0,0 +1,83 @@
+export interface Comment {
+  id: string;
+  perspective_id: string;
+  content: string;
+  created_at?: string;
+}
+
+type Pending = {
+  resolve: (comments: Comment[]) => void;
+  reject: (err: unknown) => void;
+};
+
+// Comments per page; the batch endpoint returns this many by default
+export const COMMENTS_PAGE_SIZE = 20;
+
+// Requests made within this window are sent together as one batch
+const BATCH_WINDOW_MS = 10;
+// Matches the API's cap on ids per batch request
+const MAX_BATCH_SIZE = 100;
+
+let queue = new Map<string, Pending[]>();
+let timer: ReturnType<typeof setTimeout> | null = null;
+
+const flush = async () => {
+  const batch = queue;
+  queue = new Map();
+  timer = null;
+
+  const ids = Array.from(batch.keys());
+  for (let i = 0; i < ids.length; i += MAX_BATCH_SIZE) {
+    const chunk = ids.slice(i, i + MAX_BATCH_SIZE);
+    try {
+      const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/api/comments/batch`, {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ perspective_ids: chunk, limit_per_perspective: COMMENTS_PAGE_SIZE }),
+      });
+
+      if (!response.ok) {
+        throw new Error('Failed to fetch comments');
+      }
+
+      const data: Record<string, Comment[]> = await response.json();
+      chunk.forEach((id) => {
+        batch.get(id)?.forEach(({ resolve }) => resolve(data[id] ?? []));
+      });
+    } catch (err) {
+      chunk.forEach((id) => {
+        batch.get(id)?.forEach(({ reject }) => reject(err));
+      });
+    }
+  }
+};
+
+// Load the newest comments for a perspective. Calls made by several cards at
+// about the same time are combined into a single /api/comments/batch request.
+export const loadComments = (perspectiveId: string): Promise<Comment[]> => {
+  return new Promise((resolve, reject) => {
+    const pending = queue.get(perspectiveId) ?? [];
+    pending.push({ resolve, reject });
+    queue.set(perspectiveId, pending);
+
+    if (timer === null) {
+      timer = setTimeout(flush, BATCH_WINDOW_MS);
+    }
+  });
+};
+
+// Load the page of comments older than the comment with id `before`
+export const loadOlderComments = async (perspectiveId: string, before: string): Promise<Comment[]> => {
+  const params = new URLSearchParams({ limit: String(COMMENTS_PAGE_SIZE), before });
+  const response = await fetch(
+    `${process.env.NEXT_PUBLIC_API_URL}/api/perspectives/${perspectiveId}/comments?${params}`
+  );
+
+  if (!response.ok) {
+    throw new Error('Failed to fetch comments');
+  }
+
+  return response.json();
+};
@@ -1,18 +1,24 @@
 import os
 import time
-import random
+import asyncio
+import hashlib
 import logging
+import sqlite3
+import threading
 import uuid
 import psycopg2
+from psycopg2.extras import execute_values
 import feedparser
+from collections import Counter
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Any, Optional, Set
 from urllib.parse import urlparse
 from dotenv import load_dotenv
 from textblob import TextBlob
 from bs4 import BeautifulSoup
 import anthropic
-from playwright.sync_api import Playwright, sync_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import Page, Playwright, async_playwright, TimeoutError as PlaywrightTimeoutError
 
 logging.basicConfig(
     level=logging.INFO,
@@ -28,6 +34,43 @@ load_dotenv()
 
 NEON_DB_URL = os.environ["NEON_DB_URL"]
 
+# Concurrency and politeness. Sites are crawled in parallel; within a domain
+# at most SCRAPER_PAGES_PER_DOMAIN pages are open at once and page loads are
+# spaced by a token bucket refilled at SCRAPER_DOMAIN_RATE loads per second.
+MAX_CONCURRENT_SITES = int(os.environ.get("SCRAPER_MAX_SITES", "7"))
+PAGES_PER_DOMAIN = int(os.environ.get("SCRAPER_PAGES_PER_DOMAIN", "2"))
+DOMAIN_RATE = float(os.environ.get("SCRAPER_DOMAIN_RATE", "0.5"))
+DOMAIN_BURST = float(os.environ.get("SCRAPER_DOMAIN_BURST", "2"))
+
+# Pages are reused across page loads. At most SCRAPER_PAGE_POOL_SIZE are open
+# at once, and each is replaced after SCRAPER_PAGE_MAX_NAVIGATIONS loads so
+# memory leaked by the sites' scripts doesn't pile up.
+PAGE_POOL_SIZE = int(os.environ.get("SCRAPER_PAGE_POOL_SIZE", "8"))
+PAGE_MAX_NAVIGATIONS = int(os.environ.get("SCRAPER_PAGE_MAX_NAVIGATIONS", "20"))
+
+# Articles already in the database are skipped before their page is loaded.
+# With SCRAPER_RESCRAPE_DAYS set, articles last scraped longer ago than that
+# are scraped again.
+RESCRAPE_DAYS = int(os.environ.get("SCRAPER_RESCRAPE_DAYS", "0"))
+
+# Scraped perspectives are written in batches, when SCRAPER_BATCH_SIZE are
+# waiting, every SCRAPER_FLUSH_SECONDS, and when a source is finished
+BATCH_SIZE = int(os.environ.get("SCRAPER_BATCH_SIZE", "50"))
+FLUSH_SECONDS = float(os.environ.get("SCRAPER_FLUSH_SECONDS", "10"))
+
+# Summaries are cached on disk by content, so an article whose text hasn't
+# changed is never summarized twice. At most SCRAPER_SUMMARY_WORKERS
+# requests are in flight; failed requests are retried with exponential
+# backoff by the client. The client honours ANTHROPIC_BASE_URL, which can
+# point at a local fake Messages endpoint for testing.
+SUMMARY_MODEL = os.environ.get("SCRAPER_SUMMARY_MODEL", "claude-3-5-haiku-latest")
+SUMMARY_WORKERS = int(os.environ.get("SCRAPER_SUMMARY_WORKERS", "4"))
+SUMMARY_MAX_RETRIES = int(os.environ.get("SCRAPER_SUMMARY_RETRIES", "4"))
+SUMMARY_CACHE_PATH = os.environ.get(
+    "SCRAPER_SUMMARY_CACHE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "summaries.sqlite3")
+)
+
 sources = [
     {
         "url": "https://www.foxnews.com",
@@ -106,21 +149,405 @@ selectors = {
     }
 }
 
+# Requests pages may make. Pages are only read through CSS selectors, so
+# images, media, fonts and stylesheets are never needed, and third-party
+# requests are mostly ads and analytics. Requests to the site's own domain
+# and its subdomains are allowed unless their type is blocked. Third-party
+# hosts are blocked if listed in deny_hosts, or, when a domain sets
+# allow_hosts, unless listed there.
+DEFAULT_ROUTE_RULES = {
+    "block_types": {"image", "media", "font", "stylesheet"},
+    "deny_hosts": [
+        "doubleclick.net", "googlesyndication.com", "googleadservices.com",
+        "google-analytics.com", "googletagmanager.com", "googletagservices.com",
+        "amazon-adsystem.com", "adnxs.com", "criteo.com", "taboola.com",
+        "outbrain.com", "scorecardresearch.com", "chartbeat.com", "chartbeat.net",
+        "facebook.net", "facebook.com", "twitter.com", "hotjar.com",
+        "newrelic.com", "nr-data.net", "segment.com", "optimizely.com",
+    ],
+}
+
+# The scraped sites render articles server-side, so they only need their own
+# domain
+route_rules = {
+    "www.foxnews.com": {**DEFAULT_ROUTE_RULES, "allow_hosts": []},
+    "www.newsweek.com": {**DEFAULT_ROUTE_RULES, "allow_hosts": []},
+    "www.nypost.com": {**DEFAULT_ROUTE_RULES, "allow_hosts": []},
+    "nypost.com": {**DEFAULT_ROUTE_RULES, "allow_hosts": []},
+}
+
+# Bumps the API's cache version for perspectives. pg_notify is only delivered
+# when the surrounding transaction commits, so API workers switch to fresh
+# cache keys right after new articles become visible.
+BUMP_CACHE_VERSION_SQL = """
+    WITH bumped AS (
+        UPDATE cache_versions
+        SET version = version + 1
+        WHERE namespace = %s
+        RETURNING namespace, version
+    )
+    SELECT pg_notify('cache_invalidation', namespace || ':' || version)
+    FROM bumped
+"""
+
+# Asks the API to re-fill its cache with trending searches and /api/recent
+WARM_CACHE_SQL = "SELECT pg_notify('cache_warm', 'scrape')"
+
+SAVE_PERSPECTIVES_SQL = """
+    INSERT INTO perspectives
+    (id, title, source, community, quote, sentiment, url, scraped_at)
+    VALUES %s
+    ON CONFLICT (url) DO UPDATE SET
+        quote = EXCLUDED.quote,
+        scraped_at = EXCLUDED.scraped_at
+"""
+
+# URLs that don't need scraping again this run
+KNOWN_URLS_SQL = """
+    SELECT source, url FROM perspectives
+    WHERE %(days)s = 0 OR scraped_at > NOW() - %(days)s * INTERVAL '1 day'
+"""
+
+class DomainRateLimiter:
+    """
+    Per-domain politeness limits: a token bucket refilled at `rate` page
+    loads per second (saving up at most `burst`), and at most
+    `max_concurrent` open pages per domain. Each domain has its own bucket
+    and slots, so a slow site never holds up the others.
+    """
+
+    def __init__(self, rate: float, burst: float, max_concurrent: int):
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrent = max_concurrent
+        self._tokens: Dict[str, float] = {}
+        self._updated: Dict[str, float] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+
+    async def wait(self, domain: str):
+        """Wait until the domain's bucket has a token, then take it"""
+        # Waiters queue on the lock, so tokens are handed out in order
+        async with self._locks.setdefault(domain, asyncio.Lock()):
+            now = time.monotonic()
+            elapsed = now - self._updated.get(domain, now)
+            tokens = min(self.burst, self._tokens.get(domain, self.burst) + elapsed * self.rate)
+            if tokens < 1:
+                await asyncio.sleep((1 - tokens) / self.rate)
+                tokens = 1.0
+                now = time.monotonic()
+            self._tokens[domain] = tokens - 1
+            self._updated[domain] = now
+
+    @asynccontextmanager
+    async def page_slot(self, domain: str) -> AsyncIterator[None]:
+        """Hold one of the domain's page slots, with a token for the page load"""
+        slot = self._slots.setdefault(domain, asyncio.Semaphore(self.max_concurrent))
+        async with slot:
+            await self.wait(domain)
+            yield
+
+
+class RequestBlocker:
+    """
+    Aborts the requests a page doesn't need, following the route rules of
+    the domain being scraped. Counts blocked requests by domain and reason,
+    and the bytes downloaded by the requests let through.
+    """
+
+    def __init__(self, rules: Dict[str, Dict[str, Any]], default_rules: Dict[str, Any]):
+        self.rules = rules
+        self.default_rules = default_rules
+        self.blocked: Counter = Counter()
+        self.allowed: Counter = Counter()
+        self.loaded_bytes: Counter = Counter()
+
+    @staticmethod
+    def _matches(host: str, domains) -> bool:
+        return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+    def block_reason(self, domain: str, request) -> Optional[str]:
+        """Why a request from a page on domain should be blocked, or None to let it through"""
+        # The page itself always loads
+        if request.is_navigation_request() and request.frame.parent_frame is None:
+            return None
+        
+        rules = self.rules.get(domain, self.default_rules)
+        if request.resource_type in rules.get("block_types", ()):
+            return request.resource_type
+        
+        host = urlparse(request.url).hostname or ""
+        site = domain[4:] if domain.startswith("www.") else domain
+        if self._matches(host, [site]):
+            return None
+        if "allow_hosts" in rules:
+            return None if self._matches(host, rules["allow_hosts"]) else "third-party"
+        if self._matches(host, rules.get("deny_hosts", ())):
+            return "third-party"
+        return None
+
+    async def attach(self, page: Page, current_domain: Callable[[], str]):
+        """Apply the route rules of the domain the page is on to every request it makes"""
+        async def handle(route):
+            domain = current_domain()
+            try:
+                reason = self.block_reason(domain, route.request)
+            except Exception:
+                # e.g. service worker requests have no frame
+                reason = None
+            try:
+                if reason is None:
+                    self.allowed[domain] += 1
+                    await route.continue_()
+                else:
+                    self.blocked[(domain, reason)] += 1
+                    await route.abort("blockedbyclient")
+            except Exception:
+                # The page was closed while the request was pending
+                pass
+        
+        def on_response(response):
+            length = response.headers.get("content-length", "")
+            if length.isdigit():
+                self.loaded_bytes[current_domain()] += int(length)
+        
+        await page.route("**/*", handle)
+        page.on("response", on_response)
+
+    def log_summary(self):
+        domains = sorted(set(self.allowed) | {domain for domain, _ in self.blocked})
+        for domain in domains:
+            reasons = {reason: count for (d, reason), count in self.blocked.items() if d == domain}
+            logger.info(
+                f"{domain}: blocked {sum(reasons.values())} requests {reasons}, "
+                f"allowed {self.allowed[domain]} ({self.loaded_bytes[domain] / 1e6:.1f} MB downloaded)"
+            )
+
+
+class PooledPage:
+    """A pool page and what the pool knows about it"""
+
+    def __init__(self, generation: int):
+        self.page: Optional[Page] = None
+        self.generation = generation
+        self.domain = ""
+        self.navigations = 0
+        self.crashed = False
+
+    def on_crash(self, page: Page):
+        self.crashed = True
+
+
+class PagePool:
+    """
+    A bounded pool of reusable browser pages. A page is reset to about:blank
+    when it is returned; pages that crashed, fail the reset, or have made
+    max_navigations loads are closed instead and replaced on demand, so a
+    crash only costs the page it happened in. After the browser is
+    restarted, reset() retires every page of the old browser, including
+    those still in use.
+    """
+
+    def __init__(self, size: int, max_navigations: int, new_page: Callable[[PooledPage], Awaitable[Page]]):
+        self.max_navigations = max_navigations
+        self.new_page = new_page
+        self.slots = asyncio.Semaphore(size)
+        self.idle: List[PooledPage] = []
+        self.generation = 0
+
+    def reset(self):
+        self.idle = []
+        self.generation += 1
+
+    @asynccontextmanager
+    async def page(self, domain: str) -> AsyncIterator[Page]:
+        """Hold a page for one load on domain"""
+        async with self.slots:
+            pooled = await self._take()
+            pooled.domain = domain
+            pooled.navigations += 1
+            try:
+                yield pooled.page
+            finally:
+                await self._give_back(pooled)
+
+    async def _take(self) -> PooledPage:
+        while self.idle:
+            pooled = self.idle.pop()
+            if self._usable(pooled):
+                return pooled
+            await self._close(pooled)
+        pooled = PooledPage(self.generation)
+        pooled.page = await self.new_page(pooled)
+        pooled.page.on("crash", pooled.on_crash)
+        return pooled
+
+    def _usable(self, pooled: PooledPage) -> bool:
+        return (
+            pooled.generation == self.generation
+            and not pooled.crashed
+            and not pooled.page.is_closed()
+            and pooled.navigations < self.max_navigations
+        )
+
+    async def _give_back(self, pooled: PooledPage):
+        if self._usable(pooled):
+            try:
+                # Stops the last site's scripts and doubles as a health check
+                await pooled.page.goto("about:blank", timeout=5000)
+                if self._usable(pooled):
+                    self.idle.append(pooled)
+                    return
+            except Exception as e:
+                logger.warning(f"Page failed health check, replacing it: {str(e)}")
+        await self._close(pooled)
+
+    async def _close(self, pooled: PooledPage):
+        if pooled.crashed:
+            logger.warning(f"Page crashed while on {pooled.domain}, replacing it")
+        try:
+            await pooled.page.close()
+        except Exception:
+            # Already gone with its browser
+            pass
+
+
+class SummaryCache:
+    """Summaries stored in SQLite, keyed by a hash of the model and normalized content"""
+
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS summaries (
+                key TEXT PRIMARY KEY,
+                summary TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+        """)
+        self.conn.commit()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(model: str, content: str) -> str:
+        # Whitespace differences between page loads don't change the summary
+        normalized = " ".join(content.split())
+        return hashlib.sha256(f"{model}\n{normalized}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self.lock:
+            row = self.conn.execute("SELECT summary FROM summaries WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, summary: str):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, summary, created_at) VALUES (?, ?, ?)",
+                (key, summary, datetime.now().isoformat())
+            )
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+class Summarizer:
+    """
+    Summarizes article content with Anthropic's API through one shared
+    client, at most `workers` requests at a time, caching every summary.
+    """
+
+    def __init__(self, cache: SummaryCache, model: str, workers: int, max_retries: int):
+        self.cache = cache
+        self.model = model
+        self.client = anthropic.AsyncAnthropic(
+            api_key=os.environ.get("ANTHROPIC_API_KEY"),
+            max_retries=max_retries
+        )
+        self.slots = asyncio.Semaphore(workers)
+
+    async def summarize(self, content: str) -> Optional[str]:
+        """Summarize content in a maximum of 3 sentences, or None if that failed"""
+        key = SummaryCache.key(self.model, content)
+        summary = self.cache.get(key)
+        if summary is not None:
+            logger.info(f"Using cached summary of length: {len(summary)}")
+            return summary
+        
+        prompt = f"""Please summarize the following article content in a maximum of 3 sentences, focusing on the key points:
+
+{content}
+
+Summary:"""
+        
+        try:
+            async with self.slots:
+                response = await self.client.messages.create(
+                    model=self.model,
+                    max_tokens=150,
+                    system="You are a helpful assistant that summarizes news articles concisely.",
+                    messages=[
+                        {"role": "user", "content": prompt}
+                    ],
+                    # Not every SDK version accepts temperature as an argument
+                    extra_body={"temperature": 0.3}
+                )
+            
+            summary = response.content[0].text.strip()
+            logger.info(f"Successfully generated summary of length: {len(summary)}")
+            
+        except Exception as e:
+            logger.error(f"Error summarizing with Anthropic: {str(e)}")
+            return None
+        
+        self.cache.set(key, summary)
+        return summary
+
+    async def close(self):
+        await self.client.close()
+        self.cache.close()
+
+
 class ArticleScraper:
     def __init__(self, playwright: Playwright):
         self.playwright = playwright
         self.browser = None
         self.context = None
-        self.page = None
         self.db_conn = None
+        self.invalidate_cache = False
+        self.has_recent_view = False
+        self.known_urls: Dict[str, Set[str]] = {}
+        self.pending: List[Dict[str, Any]] = []
+        self.summarizer = Summarizer(
+            SummaryCache(SUMMARY_CACHE_PATH), SUMMARY_MODEL, SUMMARY_WORKERS, SUMMARY_MAX_RETRIES
+        )
+        self.request_blocker = RequestBlocker(route_rules, DEFAULT_ROUTE_RULES)
+        self.page_pool = PagePool(PAGE_POOL_SIZE, PAGE_MAX_NAVIGATIONS, self.new_pooled_page)
+        self.rate_limiter = DomainRateLimiter(DOMAIN_RATE, DOMAIN_BURST, PAGES_PER_DOMAIN)
+        # Sites and articles are scraped concurrently but share one connection
+        self.db_lock = threading.Lock()
+        self._browser_lock = asyncio.Lock()
         
         # Connect to Neon database
         try:
             self.db_conn = psycopg2.connect(NEON_DB_URL)
             logger.info("Connected to Neon database")
+            self.invalidate_cache = self._relation_exists("cache_versions")
+            if not self.invalidate_cache:
+                logger.warning("cache_versions table not found, API cache will not be invalidated")
+            self.has_recent_view = self._relation_exists("recent_perspectives")
+            if not self.has_recent_view:
+                logger.warning("recent_perspectives view not found, it will not be refreshed")
         except Exception as e:
             logger.error(f"Error connecting to Neon database: {str(e)}")
     
+    def _relation_exists(self, name: str) -> bool:
+        """Check whether a table or view created by the API's migrations exists"""
+        cursor = self.db_conn.cursor()
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL", (name,))
+        exists = cursor.fetchone()[0]
+        self.db_conn.commit()
+        return exists
+    
     def clean_html(self, html_content: str) -> str:
         """Remove HTML tags, script, and style elements from text."""
         try:
@@ -147,22 +574,52 @@ class ArticleScraper:
             logger.error(f"Error cleaning HTML: {str(e)}")
             return html_content # Return original content on error
     
-    def setup(self):
+    async def setup(self):
         """Initialize the browser session"""
-        self.browser = self.playwright.chromium.launch(headless=True)
-        self.context = self.browser.new_context(
+        self.browser = await self.playwright.chromium.launch(headless=True)
+        self.context = await self.browser.new_context(
             user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         )
-        self.page = self.context.new_page()
         logger.info("Browser session initialized")
 
-    def teardown(self):
-        """Close browser and session"""
+    async def new_pooled_page(self, pooled: PooledPage) -> Page:
+        """Open a page for the page pool"""
+        page = await self.context.new_page()
+        await self.request_blocker.attach(page, lambda: pooled.domain)
+        return page
+
+    async def close_browser(self):
+        """Close the browser session"""
+        # Pages still in use are closed with the browser and not reused
+        self.page_pool.reset()
         try:
             if self.context:
-                self.context.close()
+                await self.context.close()
             if self.browser:
-                self.browser.close()
+                await self.browser.close()
+        except Exception as e:
+            logger.error(f"Error closing browser: {str(e)}")
+
+    async def ensure_browser(self):
+        """
+        Relaunch the browser if it disconnected. The database connection,
+        queued writes and summaries in flight are kept.
+        """
+        async with self._browser_lock:
+            if self.browser and self.browser.is_connected():
+                return
+            logger.info("Browser disconnected, reconnecting...")
+            await self.close_browser()
+            await self.setup()
+
+    async def teardown(self):
+        """Close browser and session"""
+        await self.close_browser()
+        try:
+            await self.summarizer.close()
+        except Exception as e:
+            logger.error(f"Error closing summarizer: {str(e)}")
+        try:
             if self.db_conn:
                 self.db_conn.close()
             logger.info("Browser session and database connection closed")
@@ -179,10 +636,6 @@ class ArticleScraper:
         # Return domain-specific selectors or empty dict if domain not found
         return selectors.get(domain, {})
     
-    def random_delay(self, min_seconds: float = 1.0, max_seconds: float = 3.0):
-        """Add random delay to avoid detection"""
-        time.sleep(random.uniform(min_seconds, max_seconds))
-    
     def analyze_sentiment(self, text: str) -> float:
         """Analyze sentiment of text and return a score between -1 and 1"""
         try:
@@ -234,38 +687,8 @@ class ArticleScraper:
             logger.error(f"Error extracting title from URL: {str(e)}")
             return "Untitled Article"
     
-    def summarize_with_anthropic(self, content: str) -> str:
-        """Summarize content using Anthropic's Claude API in a maximum of 3 sentences"""
-        try:
-            client = anthropic.Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
-            
-            prompt = f"""Please summarize the following article content in a maximum of 3 sentences, focusing on the key points:
-
-{content}
-
-Summary:"""
-            
-            response = client.messages.create(
-                model="claude-3-5-haiku-latest",
-                max_tokens=150,
-                temperature=0.3,
-                system="You are a helpful assistant that summarizes news articles concisely.",
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            
-            summary = response.content[0].text.strip()
-            logger.info(f"Successfully generated summary of length: {len(summary)}")
-            return summary
-            
-        except Exception as e:
-            logger.error(f"Error summarizing with Anthropic: {str(e)}")
-            return content 
-    
-    def scrape_article(self, url: str, source_name: str, community: str) -> Optional[Dict[str, Any]]:
+    async def scrape_article(self, url: str, source_name: str, community: str) -> Optional[Dict[str, Any]]:
         """Scrape a single article page and format as Perspective"""
-        article_page = None
         try:
             # Validate URL
             if not url.startswith(('http://', 'https://')):
@@ -279,15 +702,57 @@ Summary:"""
                 logger.warning(f"No selectors found for domain: {domain}")
                 return None
             
-            logger.info(f"Scraping article: {url}")
+            async with self.rate_limiter.page_slot(domain):
+                extracted = await self.extract_article(url, site_selectors)
+            if extracted is None:
+                return None
+            title, content_text = extracted
+            
+            # Text processing runs off the event loop so other pages keep loading
+            content_text = await asyncio.to_thread(self.clean_html, content_text)
+            if not content_text:
+                logger.warning(f"No content found for {url}, skipping")
+                return None
+            
+            sentiment_score = await asyncio.to_thread(self.analyze_sentiment, content_text)
+            quote = await self.summarizer.summarize(content_text)
+            if quote is None:
+                # Not saved, so the URL stays unknown and the next run retries it
+                logger.warning(f"No summary for {url}, leaving it for the next run")
+                return None
             
-            # Create a new page for each article to avoid connection issues
-            article_page = self.context.new_page()
+            if url == "https://www.newsweek.com":
+                if title.split(" ")[-1].isnumeric():
+                    title = title.split(" ")[:-1]
+                    title = " ".join(title)
+            
+            perspective = {
+                "id": str(uuid.uuid4()),
+                "title": title,
+                "source": source_name,
+                "community": community,
+                "quote": self.clean_html(quote),
+                "sentiment": sentiment_score,
+                "url": url,
+                "date": datetime.now().isoformat(),
+                "scraped_at": datetime.now().isoformat()
+            }
             
+            print(perspective)
+            return perspective
+            
+        except Exception as e:
+            logger.error(f"Unexpected error scraping {url}: {str(e)}")
+            return None
+    
+    async def extract_article(self, url: str, site_selectors: Dict[str, Any]) -> Optional[tuple]:
+        """Load an article page and return its (title, raw content text)"""
+        logger.info(f"Scraping article: {url}")
+        
+        async with self.page_pool.page(self.get_domain(url)) as article_page:
             # Set a longer timeout and handle network errors
             try:
-                article_page.goto(url, wait_until="domcontentloaded", timeout=60000)
-                self.random_delay()
+                await article_page.goto(url, wait_until="domcontentloaded", timeout=60000)
             except PlaywrightTimeoutError:
                 logger.error(f"Timeout while loading {url}")
                 return None
@@ -297,14 +762,14 @@ Summary:"""
             
             # Wait for content to be available
             try:
-                article_page.wait_for_selector(site_selectors["title"], timeout=10000)
+                await article_page.wait_for_selector(site_selectors["title"], timeout=10000)
             except PlaywrightTimeoutError:
                 logger.warning(f"Title selector not found for {url}")
             
             title = None
-            title_element = article_page.query_selector(site_selectors["title"])
+            title_element = await article_page.query_selector(site_selectors["title"])
             if title_element:
-                title = title_element.text_content().strip()
+                title = (await title_element.text_content()).strip()
                 logger.info(f"Found title: {title}")
             
             # If still no title, use page title or extract from URL
@@ -313,11 +778,10 @@ Summary:"""
                 logger.info(f"Using URL-based title: {title}")
             
             content_text = ""
-            content_elements = []
             try:
-                content_elements = article_page.query_selector_all(site_selectors["content"])
+                content_elements = await article_page.query_selector_all(site_selectors["content"])
                 if content_elements:
-                    content_text = " ".join([el.text_content().strip() for el in content_elements])
+                    content_text = " ".join([(await el.text_content()).strip() for el in content_elements])
                     logger.info(f"Found content length: {len(content_text)}")
                 else:
                     logger.warning(f"No content elements found for {url}")
@@ -325,46 +789,7 @@ Summary:"""
                 logger.error(f"Error extracting content: {str(e)}")
                 return None
             
-            content_text = self.clean_html(content_text)
-            sentiment_score = self.analyze_sentiment(content_text)
-            
-
-            quote = self.summarize_with_anthropic(content_text)
-
-            
-            if not content_text:
-                logger.warning(f"No content found for {url}, skipping")
-                return None
-            
-            if url == "https://www.newsweek.com":
-                if title.split(" ")[-1].isnumeric():
-                    title = title.split(" ")[:-1]
-                    title = " ".join(title)
-            
-            perspective = {
-                "id": str(uuid.uuid4()),
-                "title": title,
-                "source": source_name,
-                "community": community,
-                "quote": self.clean_html(quote),
-                "sentiment": sentiment_score,
-                "url": url,
-                "date": datetime.now().isoformat(),
-                "scraped_at": datetime.now().isoformat()
-            }
-            
-            print(perspective)
-            return perspective
-            
-        except Exception as e:
-            logger.error(f"Unexpected error scraping {url}: {str(e)}")
-            return None
-        finally:
-            if article_page:
-                try:
-                    article_page.close()
-                except Exception as e:
-                    logger.error(f"Error closing article page: {str(e)}")
+            return title, content_text
     
     def scrape_rss_feed(self, url: str, source_name: str, community: str) -> List[Dict[str, Any]]:
         """Scrape articles from an RSS feed"""
@@ -385,6 +810,9 @@ Summary:"""
                     title = entry.title
                     link = entry.link
                     
+                    if self.is_known(source_name, link):
+                        continue
+                    
                     # Skip newsletter signups and other non-article content
                     if self._is_newsletter_or_non_article(title, link):
                         logger.info(f"  Skipping non-article entry: {title[:50]}...")
@@ -459,22 +887,34 @@ Summary:"""
         return False
     
     def save_to_database(self, perspective: Dict[str, Any]):
-        """Save perspective to Neon database"""
+        """Queue a perspective to be saved to Neon database"""
         if not self.db_conn:
             logger.warning("Database connection not available, skipping save")
             return
             
-        try:
-            cursor = self.db_conn.cursor()
-            
-            
-            cursor.execute("""
-                INSERT INTO perspectives 
-                (id, title, source, community, quote, sentiment, url, scraped_at)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (url) DO UPDATE SET
-                    quote = EXCLUDED.quote
-            """, (
+        with self.db_lock:
+            self.pending.append(perspective)
+            if len(self.pending) >= BATCH_SIZE:
+                self._flush()
+    
+    def flush_to_database(self):
+        """Save all queued perspectives"""
+        with self.db_lock:
+            self._flush()
+    
+    async def flush_periodically(self):
+        while True:
+            await asyncio.sleep(FLUSH_SECONDS)
+            await asyncio.to_thread(self.flush_to_database)
+    
+    def _flush(self):
+        batch, self.pending = self.pending, []
+        if not batch or not self.db_conn:
+            return
+        
+        # A batch can't upsert the same URL twice, so keep the latest copy
+        rows = list({
+            perspective["url"]: (
                 perspective["id"],
                 perspective["title"],
                 perspective["source"],
@@ -483,16 +923,110 @@ Summary:"""
                 perspective["sentiment"],
                 perspective["url"],
                 perspective["scraped_at"]
-            ))
+            )
+            for perspective in batch
+        }.values())
+        
+        try:
+            cursor = self.db_conn.cursor()
+            execute_values(cursor, SAVE_PERSPECTIVES_SQL, rows, page_size=len(rows))
+            saved = rows
+        except Exception as e:
+            logger.warning(f"Error saving batch of {len(rows)} perspectives, saving one at a time: {str(e)}")
+            self.db_conn.rollback()
+            saved = self._save_rows(rows)
+        
+        try:
+            if saved and self.invalidate_cache:
+                cursor = self.db_conn.cursor()
+                cursor.execute(BUMP_CACHE_VERSION_SQL, ("perspectives",))
             
             self.db_conn.commit()
-            logger.info(f"Saved perspective to database: {perspective['id']}")
+            for row in saved:
+                self.known_urls.setdefault(row[2], set()).add(row[6])
+            logger.info(f"Saved {len(saved)}/{len(rows)} perspectives to database")
             
         except Exception as e:
             logger.error(f"Error saving to database: {str(e)}")
             self.db_conn.rollback()
     
-    def scrape_news_site(self, source: Dict[str, str]) -> List[Dict[str, Any]]:
+    def _save_rows(self, rows: List[tuple]) -> List[tuple]:
+        """Insert rows one at a time, each under a savepoint so a bad row doesn't abort the rest"""
+        saved = []
+        cursor = self.db_conn.cursor()
+        for row in rows:
+            try:
+                cursor.execute("SAVEPOINT save_perspective")
+                execute_values(cursor, SAVE_PERSPECTIVES_SQL, [row])
+                cursor.execute("RELEASE SAVEPOINT save_perspective")
+                saved.append(row)
+            except Exception as e:
+                logger.error(f"Error saving to database: {row[6]}: {str(e)}")
+                try:
+                    cursor.execute("ROLLBACK TO SAVEPOINT save_perspective")
+                except Exception:
+                    # The connection itself failed, the rest would too
+                    self.db_conn.rollback()
+                    return []
+        return saved
+    
+    def load_known_urls(self):
+        """Load the URLs already stored for each source"""
+        if not self.db_conn:
+            return
+            
+        try:
+            cursor = self.db_conn.cursor()
+            cursor.execute(KNOWN_URLS_SQL, {"days": RESCRAPE_DAYS})
+            for source_name, url in cursor:
+                self.known_urls.setdefault(source_name, set()).add(url)
+            self.db_conn.commit()
+            logger.info(f"Loaded {sum(len(urls) for urls in self.known_urls.values())} known URLs")
+            
+        except Exception as e:
+            logger.error(f"Error loading known URLs: {str(e)}")
+            self.db_conn.rollback()
+    
+    def is_known(self, source_name: str, url: str) -> bool:
+        return url in self.known_urls.get(source_name, ())
+    
+    def refresh_recent_perspectives(self):
+        """Refresh the API's recent_perspectives view after a scrape"""
+        if not self.db_conn or not self.has_recent_view:
+            return
+            
+        try:
+            cursor = self.db_conn.cursor()
+            # CONCURRENTLY keeps /api/recent readable during the refresh
+            cursor.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY recent_perspectives")
+            
+            # /api/recent may have been cached from the old view contents
+            if self.invalidate_cache:
+                cursor.execute(BUMP_CACHE_VERSION_SQL, ("perspectives",))
+            
+            self.db_conn.commit()
+            logger.info("Refreshed recent_perspectives view")
+            
+        except Exception as e:
+            logger.error(f"Error refreshing recent_perspectives view: {str(e)}")
+            self.db_conn.rollback()
+    
+    def request_cache_warm(self):
+        """Tell the API a scrape has finished so it can warm its cache"""
+        if not self.db_conn or not self.invalidate_cache:
+            return
+            
+        try:
+            cursor = self.db_conn.cursor()
+            cursor.execute(WARM_CACHE_SQL)
+            self.db_conn.commit()
+            logger.info("Requested API cache warm")
+            
+        except Exception as e:
+            logger.error(f"Error requesting API cache warm: {str(e)}")
+            self.db_conn.rollback()
+    
+    async def scrape_news_site(self, source: Dict[str, str]) -> List[Dict[str, Any]]:
         """Scrape articles from a news website"""
         url = source["url"]
         source_name = source["source"]
@@ -502,51 +1036,71 @@ Summary:"""
 
         logger.info(f"Extracted domain: {domain}")
         
-        perspectives = []
-        
         if site_selectors.get("rss", False):
-            return self.scrape_rss_feed(url, source_name, community)
+            return await asyncio.to_thread(self.scrape_rss_feed, url, source_name, community)
         
         try:
+            async with self.rate_limiter.page_slot(domain):
+                article_links = await self.find_article_links(url, source_name, site_selectors)
+            
+            new_links = [link for link in article_links if not self.is_known(source_name, link)]
+            logger.info(f"Skipping {len(article_links) - len(new_links)} already scraped articles from {source_name}")
+            article_links = new_links
+            
+            # Scrape the articles concurrently; the rate limiter paces each domain
+            results = await asyncio.gather(*(
+                self.scrape_and_save(link, i, len(article_links), source_name, community)
+                for i, link in enumerate(article_links)
+            ))
+            return [perspective for perspective in results if perspective]
+                    
+        except PlaywrightTimeoutError:
+            logger.error(f"Timeout while scraping {url}")
+        except Exception as e:
+            logger.error(f"Error scraping {url}: {str(e)}")
+            
+        return []
+    
+    async def find_article_links(self, url: str, source_name: str, site_selectors: Dict[str, Any]) -> List[str]:
+        """Load a site's front page and collect its article links"""
+        async with self.page_pool.page(self.get_domain(url)) as page:
             logger.info(f"Visiting {url}")
             try:
                 # Add retry logic for page navigation
                 retries = 2
                 for attempt in range(retries):
                     try:
-                        self.page.goto(url, wait_until="domcontentloaded", timeout=45000)
+                        await page.goto(url, wait_until="domcontentloaded", timeout=45000)
                         break
                     except PlaywrightTimeoutError:
                         if attempt < retries - 1:
                             logger.warning(f"Timeout on attempt {attempt+1}, retrying...")
-                            time.sleep(2)
+                            await asyncio.sleep(2)
                         else:
                             raise
             except Exception as e:
                 logger.error(f"Failed to load {url}: {str(e)}")
-                return perspectives
-                
-            self.random_delay(2.0, 4.0)
+                return []
             
             # Find article links - use more specific selectors for each site
             article_selector = site_selectors.get("articles")
             logger.info(f"Using article selector: {article_selector}")
-            article_elements = self.page.query_selector_all(article_selector)
+            article_elements = await page.query_selector_all(article_selector)
             article_links = []
             seen_urls = set()  # Track URLs we've already seen
             
             logger.info(f"Found {len(article_elements)} potential article elements on {source_name}")
             
-            for i, element in enumerate(article_elements):  # Limit to first 10 articles
+            for i, element in enumerate(article_elements):
                 try:
                     # Try to get href directly if element is an anchor
-                    href = element.get_attribute("href")
+                    href = await element.get_attribute("href")
                     
                     # If not an anchor, look for anchor inside
                     if not href:
-                        link_element = element.query_selector("a")
+                        link_element = await element.query_selector("a")
                         if link_element:
-                            href = link_element.get_attribute("href")
+                            href = await link_element.get_attribute("href")
                     
                     if href:
                         # Handle relative URLs
@@ -562,9 +1116,9 @@ Summary:"""
                         article_links.append(href)
                         
                         # Log article title if available
-                        title_element = element.query_selector(site_selectors.get("title"))
+                        title_element = await element.query_selector(site_selectors.get("title"))
                         if title_element:
-                            title = title_element.text_content().strip()
+                            title = (await title_element.text_content()).strip()
                             if not title or len(title) < 5:
                                 title = self.get_title_from_url(href)
                                 logger.info(f"  Article {i+1}: {title[:50]}... (from URL) - {href}")
@@ -578,63 +1132,75 @@ Summary:"""
                     continue
             
             logger.info(f"Successfully extracted {len(article_links)} article links from {source_name}")
-            
-            # Scrape each article
-            for i, link in enumerate(article_links):  
-                try:
-                    logger.info(f"Scraping article {i+1}/{len(article_links)}: {link}")
-                    perspective = self.scrape_article(link, source_name, community)
-                    if perspective:
-                        perspectives.append(perspective)
-                        logger.info(f"  Successfully scraped: {perspective['title'][:50]}...")
-                        self.save_to_database(perspective)
-                    else:
-                        logger.warning(f"  Failed to extract content from: {link}")
-                    self.random_delay()
-                except Exception as e:
-                    logger.error(f"Error scraping article {link}: {str(e)}")
-                    if not self.browser.is_connected():
-                        logger.info("Browser disconnected, reconnecting...")
-                        self.teardown()
-                        self.setup()
-                    continue
-                    
-        except PlaywrightTimeoutError:
-            logger.error(f"Timeout while scraping {url}")
+            return article_links
+    
+    async def scrape_and_save(self, link: str, i: int, total: int, source_name: str, community: str) -> Optional[Dict[str, Any]]:
+        """Scrape one article and save it"""
+        try:
+            logger.info(f"Scraping article {i+1}/{total}: {link}")
+            perspective = await self.scrape_article(link, source_name, community)
+            if not perspective and not self.browser.is_connected():
+                # The browser went away during the load, try once more in a new one
+                await self.ensure_browser()
+                perspective = await self.scrape_article(link, source_name, community)
+            if perspective:
+                logger.info(f"  Successfully scraped: {perspective['title'][:50]}...")
+                await asyncio.to_thread(self.save_to_database, perspective)
+            else:
+                logger.warning(f"  Failed to extract content from: {link}")
+            return perspective
         except Exception as e:
-            logger.error(f"Error scraping {url}: {str(e)}")
-            
-        return perspectives
+            logger.error(f"Error scraping article {link}: {str(e)}")
+            await self.ensure_browser()
+            return None
+    
+    async def scrape_source(self, source: Dict[str, str], site_slots: asyncio.Semaphore) -> List[Dict[str, Any]]:
+        """Scrape one source, logging instead of raising"""
+        async with site_slots:
+            try:
+                logger.info(f"Scraping {source['source']}")
+                perspectives = await self.scrape_news_site(source)
+                await asyncio.to_thread(self.flush_to_database)
+                logger.info(f"Successfully scraped {len(perspectives)} articles from {source['source']}")
+                return perspectives
+            except Exception as e:
+                logger.error(f"Error processing {source['source']}: {str(e)}")
+                # Check if browser is still connected, if not, reconnect
+                await self.ensure_browser()
+                return []
     
-    def run(self):
+    async def run(self):
         """Main execution method"""
         try:
-            self.setup()
+            await self.setup()
+            await asyncio.to_thread(self.load_known_urls)
+            flusher = asyncio.create_task(self.flush_periodically())
             
-            for source in sources:
-                try:
-                    logger.info(f"Scraping {source['source']}")
-                    perspectives = self.scrape_news_site(source)
-                    logger.info(f"Successfully scraped {len(perspectives)} articles from {source['source']}")
-                    self.random_delay(3.0, 6.0)  # Longer delay between sites
-                except Exception as e:
-                    logger.error(f"Error processing {source['source']}: {str(e)}")
-                    # Check if browser is still connected, if not, reconnect
-                    if not self.browser.is_connected():
-                        logger.info("Browser disconnected, reconnecting...")
-                        self.teardown()
-                        self.setup()
-                    continue
+            # Sites run in parallel, so a run takes as long as the slowest site
+            site_slots = asyncio.Semaphore(MAX_CONCURRENT_SITES)
+            try:
+                await asyncio.gather(*(self.scrape_source(source, site_slots) for source in sources))
+            finally:
+                flusher.cancel()
+                await asyncio.to_thread(self.flush_to_database)
+                self.request_blocker.log_summary()
+            
+            await asyncio.to_thread(self.refresh_recent_perspectives)
+            await asyncio.to_thread(self.request_cache_warm)
                     
         finally:
-            self.teardown()
+            await self.teardown()
 
 
-def run(playwright: Playwright) -> None:
+async def run(playwright: Playwright) -> None:
     scraper = ArticleScraper(playwright)
-    scraper.run()
+    await scraper.run()
+
+
+async def main() -> None:
+    async with async_playwright() as playwright:
+        await run(playwright)
 
 
 if __name__ == "__main__":
-    with sync_playwright() as playwright:
-        run(playwright)
+    asyncio.run(main())